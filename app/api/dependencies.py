@@ -1,20 +1,23 @@
-import os
+import hmac
 from fastapi import Header, HTTPException, Security
 from fastapi.security.api_key import APIKeyHeader
-from dotenv import load_dotenv
-
-load_dotenv()
+import settings
+from app.services.session.manager import SessionManager, get_session_manager
 
 API_KEY_NAME = "x-api-key"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
-import settings
+# Resolved once at import (settings already loads .env)
+_EXPECTED_API_KEY = settings.API_KEY.encode()
 
 async def get_api_key(api_key_header: str = Security(api_key_header)):
-    expected_api_key = settings.API_KEY
-    if api_key_header == expected_api_key:
+    if api_key_header and hmac.compare_digest(api_key_header.encode(), _EXPECTED_API_KEY):
         return api_key_header
     else:
         raise HTTPException(
             status_code=403, detail="Could not validate API key"
         )
+
+async def session_manager_dep() -> SessionManager:
+    # async so FastAPI calls it inline instead of via the threadpool
+    return get_session_manager()
@@ -0,0 +1,25 @@
+"""
+APIRoute that parses JSON request bodies with orjson instead of stdlib json.
+"""
+import orjson
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    async def json(self):
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI's
+            # malformed-body handling is unchanged
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    def get_route_handler(self):
+        original_handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: Request):
+            return await original_handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_route_handler
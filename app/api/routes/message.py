@@ -1,190 +1,198 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.models.schemas import MessageRequest, MessageResponse, EngagementMetrics, ExtractedIntelligence
-from app.api.dependencies import get_api_key
-from app.services.session.manager import get_session_manager
+from app.api.dependencies import get_api_key, session_manager_dep
+from app.api.json_route import ORJSONRoute
+from app.services.session.manager import SessionManager
 from app.services.detection.pipeline import get_detection_pipeline
-from datetime import datetime
-from typing import List, Dict, Any
+from app.services.engagement.agent import EngagementAgent
+from app.services.finalization.report_builder import map_intel_to_schema
+import time
+import logging
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 import settings
 
-def map_intel_to_schema(session_intel: Dict[str, Any], red_flags: List[str]) -> ExtractedIntelligence:
-    """
-    Maps AI-extracted intelligence to GUVI schema format.
-    """
-    return ExtractedIntelligence(
-        # Direct mappings
-        upiIds=session_intel.get("upiIds", []),
-        phoneNumbers=session_intel.get("phoneNumbers", []),
-        bankAccounts=session_intel.get("bankAccounts", []),
-        phishingLinks=session_intel.get("phishingLinks", []),
-
-        # Extended fields
-        amounts=session_intel.get("amounts", []),
-        bankNames=session_intel.get("bankNames", []),
-        ifscCodes=session_intel.get("ifscCodes", []),
-        emailAddresses=session_intel.get("emailAddresses", []),
-
-        # New fields (Change 5)
-        caseIds=session_intel.get("caseIds", []),
-        policyNumbers=session_intel.get("policyNumbers", []),
-        orderNumbers=session_intel.get("orderNumbers", []),
-
-        # Combine red flags with any extracted keywords
-        suspiciousKeywords=red_flags + session_intel.get("keywords", [])
-    )
+logger = logging.getLogger(__name__)
+
+# Agent notes templates (one % format per response)
+_NOTES_FLAGS = "Scam type: %s. Stage: %s. Red flags: %s."
+_NOTES_REASONING = "Scam type: %s. Stage: %s. Reasoning: %s."
+
+# Ignored (non-scam) messages all get the same empty payload; build it once
+_IGNORE_RESPONSE = MessageResponse(
+    status="success",
+    scamDetected=False,
+    engagementMetrics=EngagementMetrics(),
+    extractedIntelligence=ExtractedIntelligence(),
+    agentNotes="No scam indicators detected.",
+    reply=None,
+    action="ignore"
+)
 
 @router.post("/message", response_model=MessageResponse)
 async def handle_message(
     request: MessageRequest,
-    api_key: str = Depends(get_api_key)
+    api_key: str = Depends(get_api_key),
+    session_manager: SessionManager = Depends(session_manager_dep)
 ):
-    # 1. Initialize services
-    session_manager = get_session_manager()
-    pipeline = get_detection_pipeline()
-    
-    # 2. Load or create session
-    session = session_manager.get_session(request.sessionId)
+    # 1. Load or create session
+    session = await session_manager.get_session_async(request.sessionId)
     if not session:
         session = session_manager.create_session(request.sessionId)
         # Robustness: Recover state if history exists (e.g., server restart)
         if request.conversationHistory:
             session.turn_count = len(request.conversationHistory) // 2
             session.scam_detected = True  # History means scam was already detected - skip re-detection
-            print(f"[API] Restored session: Turn {session.turn_count}, scam_detected=True (skipping detection)")
+            logger.debug("Restored session: Turn %s, scam_detected=True (skipping detection)", session.turn_count)
     
     # Check for Phase 9: Session Closure
-    if getattr(session, "reported_to_guvi", False):
-        print(f"[API] Session {request.sessionId} already reported/closed.")
-        duration = int((datetime.now() - session.created_at).total_seconds())
+    if session.reported_to_guvi:
+        logger.debug("Session %s already reported/closed.", request.sessionId)
+        duration = int(time.time() - session.created_at)
         msg_count = session.turn_count * 2
         
-        return MessageResponse(
+        # Built when the session was reported; sessions saved before closed_intel
+        # was persisted still need it built here
+        if session.closed_intel is None:
+            session.closed_intel = map_intel_to_schema(session.extracted_intel, session.red_flags)
+        
+        # Trusted, already-typed values: skip validation
+        return MessageResponse.model_construct(
             status="success",
             scamDetected=True,
-            engagementMetrics=EngagementMetrics(
+            engagementMetrics=EngagementMetrics.model_construct(
                 engagementDurationSeconds=duration,
                 totalMessagesExchanged=msg_count
             ),
-            extractedIntelligence=map_intel_to_schema(session.extracted_intel, session.red_flags),
+            extractedIntelligence=session.closed_intel,
             agentNotes="Session closed.",
             reply=None,
             action="session_ended"
         )
 
-    # 3. Route Decision: Detection vs Engagement
-    reply_text = None
+    # 2. Route Decision: Detection vs Engagement
+    # Once a session is flagged it stays flagged, so engaged turns go straight
+    # to the engagement handler without touching the detection pipeline
+    handler = _handle_engagement if session.scam_detected else _handle_detection
+    return await handler(request, session, session_manager)
+
+
+async def _handle_detection(request: MessageRequest, session, session_manager) -> MessageResponse:
+    """PHASE 2: Detection Pipeline (session not yet flagged as scam)."""
+    pipeline = get_detection_pipeline()
     
-    if not session.scam_detected:
-        # PHASE 2: Detection Pipeline
-        print(f"[API] Processing for detection: {request.sessionId}")
-        result = await pipeline.process(request)
-        
-        action = result.get("action", "ignore")
-        decision = result.get("decision")
-        
-        # Refresh session to check for state changes
-        session = session_manager.get_session(request.sessionId)
-        
-        if session.scam_detected:
-            # Seamless transition: Generate first engagement response immediately
-            print(f"[API] Seamless transition to Engagement: {request.sessionId}")
-            
-            from app.services.engagement.agent import EngagementAgent
-            
-            # Generate response using the selected persona
-            reply_text = await EngagementAgent.generate_response(
-                session=session,
-                message_text=request.message.text,
-                history=request.conversationHistory
-            )
-            
-            # Update session
-            session_manager.update_session(session)
-            
-        else:
-            # Check for language not supported
-            if action == "not_supported":
-                return MessageResponse(
-                    status="error",
-                    scamDetected=False,
-                    engagementMetrics=EngagementMetrics(
-                        engagementDurationSeconds=0,
-                        totalMessagesExchanged=0
-                    ),
-                    extractedIntelligence=ExtractedIntelligence(),
-                    agentNotes=result.get("reason", "Language not supported"),
-                    reply=None,
-                    action="not_supported"
-                )
-            # Normal detection response (Probe or Ignore)
-            elif action == "probe":
-                reply_text = "I see. Can you provide more details so I can assist better?"
-            else:
-                # IGNORE action - no reply
-                reply_text = None
+    logger.debug("Processing for detection: %s", request.sessionId)
+    result = await pipeline.process(request, session)
     
-    # 4. PHASE 3: Engagement Pipeline
-    else:
-        print(f"[API] Routing to Engagement: {request.sessionId}")
-        
-        from app.services.engagement.agent import EngagementAgent
+    action = result.get("action", "ignore")
+    decision = result.get("decision")
+    
+    # Pipeline hands back the session it updated (no second store lookup)
+    session = result["session"]
+    
+    if session.scam_detected:
+        # Seamless transition: Generate first engagement response immediately
+        logger.debug("Seamless transition to Engagement: %s", request.sessionId)
         
-        message_text = request.message.text
+        # Generate response using the selected persona
         reply_text = await EngagementAgent.generate_response(
             session=session,
-            message_text=message_text,
+            message_text=request.message.text,
             history=request.conversationHistory
         )
         
         # Update session
         session_manager.update_session(session)
+        
+    else:
+        # Check for language not supported
+        if action == "not_supported":
+            return MessageResponse(
+                status="error",
+                scamDetected=False,
+                engagementMetrics=EngagementMetrics(
+                    engagementDurationSeconds=0,
+                    totalMessagesExchanged=0
+                ),
+                extractedIntelligence=ExtractedIntelligence(),
+                agentNotes=result.get("reason", "Language not supported"),
+                reply=None,
+                action="not_supported"
+            )
+        # Normal detection response (Probe or Ignore)
+        elif action == "probe":
+            reply_text = "I see. Can you provide more details so I can assist better?"
+        else:
+            # IGNORE action - no reply, nothing to report
+            return _IGNORE_RESPONSE.model_copy(update={"sessionId": request.sessionId})
+    
+    return _build_response(request, session, reply_text)
+
 
-    # 5. Construct Final Response Payload (GUVI Hackathon Format)
+async def _handle_engagement(request: MessageRequest, session, session_manager) -> MessageResponse:
+    """PHASE 3: Engagement Pipeline (scam already detected)."""
+    logger.debug("Routing to Engagement: %s", request.sessionId)
+    
+    message_text = request.message.text
+    reply_text = await EngagementAgent.generate_response(
+        session=session,
+        message_text=message_text,
+        history=request.conversationHistory
+    )
+    
+    # Update session
+    session_manager.update_session(session)
+    
+    return _build_response(request, session, reply_text)
+
+
+def _build_response(request: MessageRequest, session, reply_text) -> MessageResponse:
+    """Construct Final Response Payload (GUVI Hackathon Format)."""
     
     # Calculate Metrics
-    duration = int((datetime.now() - session.created_at).total_seconds())
+    duration = int(time.time() - session.created_at)
     msg_count = session.turn_count * 2
+    scam_detected = session.scam_detected
+    confidence = session.confidence
     
     # Construct Agent Notes — use LLM-generated red flags from detection phase
-    red_flags = getattr(session, 'red_flags', []) or []
-    extracted_intel = getattr(session, 'extracted_intel', {}) or {}
+    red_flags = session.red_flags
+    extracted_intel = session.extracted_intel or {}
 
-    # Deduplicate, preserve order
-    unique_flags = list(dict.fromkeys(red_flags))
+    # Deduplicate, preserve order; only the first 8 are shown
+    seen = set()
+    unique_flags = []
+    for flag in red_flags:
+        if flag not in seen:
+            seen.add(flag)
+            unique_flags.append(flag)
+            if len(unique_flags) == 8:
+                break
 
+    category = session.category
+    stage = session.stage
     if unique_flags:
-        notes = (
-            f"Scam type: {session.category or 'unknown'}. "
-            f"Stage: {session.stage}. "
-            f"Red flags: {'; '.join(unique_flags[:8])}."
-        )
+        notes = _NOTES_FLAGS % (category or 'unknown', stage, '; '.join(unique_flags))
     else:
-        notes = (
-            f"Scam type: {session.category or 'unknown'}. "
-            f"Stage: {session.stage}. "
-            f"Reasoning: {getattr(session, 'reasoning', '')[:100]}."
-        )
-
-
+        notes = _NOTES_REASONING % (category or 'unknown', stage, (session.reasoning or '')[:100])
 
-    response = MessageResponse(
+    # Every value here is produced server-side; skip validation
+    response = MessageResponse.model_construct(
         sessionId=request.sessionId,
         status="success",
-        scamDetected=session.scam_detected,
+        scamDetected=scam_detected,
         totalMessagesExchanged=msg_count,
         engagementDurationSeconds=duration,
-        engagementMetrics=EngagementMetrics(
+        engagementMetrics=EngagementMetrics.model_construct(
             engagementDurationSeconds=duration,
             totalMessagesExchanged=msg_count
         ),
         extractedIntelligence=map_intel_to_schema(extracted_intel, red_flags),
         agentNotes=notes,
-        scamType=session.category,
-        confidenceLevel=float(session.confidence) if session.confidence else None,
+        scamType=category,
+        confidenceLevel=float(confidence) if confidence else None,
         reply=reply_text,
-        action="engage" if session.scam_detected else "ignore"
+        action="engage" if scam_detected else "ignore"
     )
 
-    return response
\ No newline at end of file
+    return response
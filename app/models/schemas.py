@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Optional, Dict, Any
 
 class Message(BaseModel):
@@ -6,7 +6,8 @@ class Message(BaseModel):
     text: str = ""  # Default if missing
     timestamp: Optional[Any] = None  # Accept string OR number (epoch ms)
     
-    @validator('timestamp', pre=True, always=True)
+    @field_validator('timestamp', mode='before')
+    @classmethod
     def convert_timestamp(cls, v):
         """Auto-convert numeric timestamps to strings"""
         if v is None:
@@ -16,16 +17,20 @@ class Message(BaseModel):
         return str(v)  # Ensure it's a string
 
 class MessageRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    
     sessionId: str
     message: Message
-    conversationHistory: Optional[List[Dict[str, Any]]] = None  # Allow None
+    conversationHistory: Optional[List[Dict[str, Any]]] = Field(None, validate_default=True)  # Allow None
     metadata: Optional[Dict[str, Any]] = None
     
-    @validator('conversationHistory', pre=True, always=True)
+    @field_validator('conversationHistory', mode='before')
+    @classmethod
     def default_history(cls, v):
         return v or []
     
-    @validator('message', pre=True)
+    @field_validator('message', mode='before')
+    @classmethod
     def parse_message(cls, v):
         # If message is just a string, convert to object
         if isinstance(v, str):
@@ -65,6 +70,8 @@ class ExtractedIntelligence(BaseModel):
 
 
 class MessageResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    
     # Required fields (penalty if missing)
     sessionId: str = ""
     status: str = Field(..., description="'success' or 'error'")
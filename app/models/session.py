@@ -1,6 +1,33 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import List, Dict, Any, Literal, Optional, Tuple
 from datetime import datetime
+import sys
+import time
+from app.models.schemas import ExtractedIntelligence
+
+
+class ConversationLog(BaseModel):
+    """
+    Column-oriented turn store: one list per attribute instead of one dict per turn.
+    Serializes as three arrays, so payload size doesn't repeat keys per turn.
+    """
+    roles: List[str] = Field(default_factory=list)
+    contents: List[str] = Field(default_factory=list)
+    timestamps: List[float] = Field(default_factory=list)
+    
+    def append(self, role: str, content: str, limit: Optional[int] = None, timestamp: Optional[float] = None):
+        """Append a turn; keep only the last `limit` turns if given."""
+        self.roles.append(sys.intern(role))
+        self.contents.append(content)
+        self.timestamps.append(time.time() if timestamp is None else timestamp)
+        if limit is not None and len(self.roles) > limit:
+            del self.roles[:-limit]
+            del self.contents[:-limit]
+            del self.timestamps[:-limit]
+    
+    def __len__(self) -> int:
+        return len(self.roles)
+
 
 class SessionData(BaseModel):
     """
@@ -10,15 +37,17 @@ class SessionData(BaseModel):
     - Removed: detection_mode field (no strict mode)
     - Simplified: Only normal mode exists now
     """
+    model_config = ConfigDict(populate_by_name=True)
+    
     # Core Identity
     session_id: str = Field(..., alias="sessionId")
-    status: str = Field("active", description="active, completed, ended")
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    status: Literal["active", "completed", "ended"] = "active"
+    created_at: float = Field(default_factory=time.time)  # epoch seconds
+    updated_at: float = Field(default_factory=time.time)
     
     # Conversation State
     turn_count: int = 0
-    conversation_history: List[Dict[str, Any]] = []
+    log: ConversationLog = Field(default_factory=ConversationLog)
     
     # Phase 2: Detection Metadata
     scam_detected: bool = False
@@ -32,7 +61,7 @@ class SessionData(BaseModel):
     scam_type: Optional[str] = None
     confidence: Optional[float] = 0.0
     reasoning: Optional[str] = None
-    red_flags: List[str] = []
+    red_flags: Tuple[str, ...] = ()  # write-once from detection
     
     # Phase 3: Engagement State
     persona: Optional[str] = None
@@ -43,9 +72,31 @@ class SessionData(BaseModel):
     
     # Finalization
     reported_to_guvi: bool = False
+    closed_intel: Optional[ExtractedIntelligence] = None  # response intel, frozen when reported
+    
+    @field_validator('category', 'scam_type', 'stage')
+    @classmethod
+    def intern_label(cls, v):
+        """Labels come from a small fixed vocabulary; share one str object per value"""
+        return sys.intern(v) if v is not None else v
     
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    @field_validator('created_at', 'updated_at', mode='before')
+    @classmethod
+    def parse_legacy_timestamp(cls, v):
+        """Accept ISO strings from sessions stored before timestamps were epoch floats"""
+        if isinstance(v, str):
+            return datetime.fromisoformat(v).timestamp()
+        return v
+    
+    @property
+    def conversation_history(self) -> List[Dict[str, Any]]:
+        """Row view of `log` for callers that want one dict per turn."""
+        log = self.log
+        return [
+            {"role": r, "content": c, "timestamp": t}
+            for r, c, t in zip(log.roles, log.contents, log.timestamps)
+        ]
+
+
+# Built once; the session store validates/dumps through these directly
+SESSION_ADAPTER: TypeAdapter[SessionData] = TypeAdapter(SessionData)
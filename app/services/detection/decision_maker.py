@@ -5,16 +5,24 @@ This module applies confidence thresholds to LLM detection results
 and makes the final decision: ENGAGE, PROBE, or IGNORE.
 """
 
-from typing import Literal
+import bisect
+import functools
+import logging
+from typing import Final, Literal
 from dataclasses import dataclass
 from app.services.detection.llm_detector import ScamDetectionResult
 import settings
 
 
+logger = logging.getLogger(__name__)
+
 DecisionAction = Literal["engage", "probe", "ignore"]
 
+# Actions that flag the session as a scam and hand it to engagement
+SCAM_ACTIONS: Final[frozenset[str]] = frozenset({"engage", "probe"})
+
 
-@dataclass
+@dataclass(slots=True)
 class FinalDecision:
     """
     Final decision after applying thresholds.
@@ -24,17 +32,33 @@ class FinalDecision:
         scam_detected: Whether scam was detected
         confidence: Confidence score from LLM
         category: Detected scam category
-        reasoning: Decision reasoning
         threshold_used: Threshold that was applied
-        red_flags: List of red flags
+        red_flags: Red flags (immutable)
+        reasoning_template: Decision reasoning template (see `reasoning`)
+        llm_reasoning: Reasoning text from the LLM detector
+    
+    `reasoning` is formatted on access: ignored messages never read it.
     """
     action: DecisionAction
     scam_detected: bool
     confidence: float
     category: str | None
-    reasoning: str
     threshold_used: float
-    red_flags: list
+    red_flags: tuple
+    reasoning_template: str
+    llm_reasoning: str
+    
+    @property
+    def reasoning(self) -> str:
+        """Decision reasoning"""
+        return self.reasoning_template.format(
+            confidence=self.confidence,
+            threshold=self.threshold_used,
+            reasoning=self.llm_reasoning
+        )
+
+
+_NOT_SCAM_REASONING = "LLM classified as NOT scam. {reasoning}"
 
 
 class DecisionMaker:
@@ -44,6 +68,8 @@ class DecisionMaker:
     SIMPLIFIED VERSION - No strict mode, single threshold system.
     """
     
+    __slots__ = ("_engage_threshold", "_probe_threshold", "_bins", "_table")
+    
     def __init__(
         self,
         engage_threshold: float = None,
@@ -57,10 +83,30 @@ class DecisionMaker:
             probe_threshold: Threshold for PROBE (default: 0.55)
         """
         # Load thresholds from settings
-        self.engage_threshold = engage_threshold or getattr(settings, 'DETECTION_THRESHOLD', 0.75)
-        self.probe_threshold = probe_threshold or getattr(settings, 'PROBE_THRESHOLD', 0.55)
+        et = self._engage_threshold = engage_threshold or getattr(settings, 'DETECTION_THRESHOLD', 0.75)
+        pt = self._probe_threshold = probe_threshold or getattr(settings, 'PROBE_THRESHOLD', 0.55)
         
-        print(f"[DecisionMaker] Initialized - Engage: {self.engage_threshold}, Probe: {self.probe_threshold}")
+        # Confidence bands for is_scam=True, indexed by bisect over _bins:
+        # below probe → IGNORE, probe..engage → PROBE, engage and above → ENGAGE
+        self._bins = (pt, et)
+        self._table = (
+            ("ignore", False, pt,
+             "Confidence too low ({confidence:.2f} < {threshold}). {reasoning}"),
+            ("probe", True, pt,
+             "Medium confidence scam. Cautious engagement. {reasoning}"),
+            ("engage", True, et,
+             "High confidence scam detected. {reasoning}"),
+        )
+        
+        logger.debug("Initialized - Engage: %s, Probe: %s", et, pt)
+    
+    @property
+    def engage_threshold(self) -> float:
+        return self._engage_threshold
+    
+    @property
+    def probe_threshold(self) -> float:
+        return self._probe_threshold
         
     def make_decision(self, detection_result: ScamDetectionResult) -> FinalDecision:
         """
@@ -77,68 +123,46 @@ class DecisionMaker:
         Returns:
             FinalDecision with action and metadata
         """
+        # Most traffic is benign: test it first
         if not detection_result.is_scam:
             return FinalDecision(
                 action="ignore",
                 scam_detected=False,
                 confidence=detection_result.confidence,
                 category=detection_result.primary_category,
-                reasoning=f"LLM classified as NOT scam. {detection_result.reasoning}",
-                threshold_used=self.engage_threshold,
-                red_flags=detection_result.red_flags
+                threshold_used=self._engage_threshold,
+                red_flags=tuple(detection_result.red_flags),
+                reasoning_template=_NOT_SCAM_REASONING,
+                llm_reasoning=detection_result.reasoning
             )
         
-        # is_scam = True
-        if detection_result.confidence >= self.engage_threshold:
-            # High confidence scam → ENGAGE fully
-            return FinalDecision(
-                action="engage",
-                scam_detected=True,
-                confidence=detection_result.confidence,
-                category=detection_result.primary_category,
-                reasoning=f"High confidence scam detected. {detection_result.reasoning}",
-                threshold_used=self.engage_threshold,
-                red_flags=detection_result.red_flags
-            )
+        conf = detection_result.confidence
         
-        elif detection_result.confidence >= self.probe_threshold:
-            # Medium confidence → PROBE (cautious engagement)
-            return FinalDecision(
-                action="probe",
-                scam_detected=True,
-                confidence=detection_result.confidence,
-                category=detection_result.primary_category,
-                reasoning=f"Medium confidence scam. Cautious engagement. {detection_result.reasoning}",
-                threshold_used=self.probe_threshold,
-                red_flags=detection_result.red_flags
-            )
-        
-        else:
-            # Low confidence → IGNORE
-            return FinalDecision(
-                action="ignore",
-                scam_detected=False,
-                confidence=detection_result.confidence,
-                category=detection_result.primary_category,
-                reasoning=f"Confidence too low ({detection_result.confidence:.2f} < {self.probe_threshold}). {detection_result.reasoning}",
-                threshold_used=self.probe_threshold,
-                red_flags=detection_result.red_flags
-            )
+        # is_scam = True: bin confidence against (probe, engage) thresholds.
+        # bisect_right so a score equal to a threshold lands in the higher band.
+        action, scam_detected, threshold_used, template = self._table[
+            bisect.bisect_right(self._bins, conf)
+        ]
+        return FinalDecision(
+            action=action,
+            scam_detected=scam_detected,
+            confidence=conf,
+            category=detection_result.primary_category,
+            threshold_used=threshold_used,
+            red_flags=tuple(detection_result.red_flags),
+            reasoning_template=template,
+            llm_reasoning=detection_result.reasoning
+        )
 
 
 # ============================================================
 # Global Singleton Instance
 # ============================================================
 
-_decision_maker: DecisionMaker | None = None
-
-
+@functools.cache
 def get_decision_maker() -> DecisionMaker:
     """Get or create global decision maker instance."""
-    global _decision_maker
-    if _decision_maker is None:
-        _decision_maker = DecisionMaker()
-    return _decision_maker
+    return DecisionMaker()
 
 
 def make_final_decision(detection_result: ScamDetectionResult) -> FinalDecision:
@@ -0,0 +1,69 @@
+"""
+Shared keyword matcher for detection heuristics.
+
+All keyword sets live in one table and are matched with a single compiled,
+case-insensitive regex, so a message is scanned once no matter how many
+sets a caller needs.
+"""
+import re
+from typing import Dict, List
+
+# keyword -> tags of the sets it belongs to
+_KEYWORD_TAGS: Dict[str, tuple] = {
+    "police": ("scam",),
+    "arrest": ("scam", "digital_arrest"),
+    "arrest warrant": ("scam", "scam_strong", "digital_arrest"),
+    "digital arrest": ("scam", "scam_strong", "digital_arrest"),
+    "verify": ("scam",),
+    "account": ("scam",),
+    "blocked": ("scam",),
+    # Named in warnings too ("CBI never calls..."), so not a strong tell on its own
+    "cbi": ("scam", "digital_arrest"),
+    "aadhaar": ("scam",),
+    "money laundering": ("scam", "scam_strong"),
+    # Demand / payment cues: what separates a scam from an awareness message
+    "pay": ("demand",),
+    "payment": ("demand",),
+    "transfer": ("demand",),
+    "deposit": ("demand",),
+    "send money": ("demand",),
+    "upi": ("demand",),
+    "otp": ("demand",),
+}
+
+# Tags that can decide a verdict without the LLM match whole words only
+# ("upi" must not fire inside "stupid", nor "pay" inside "repayment")
+_WHOLE_WORD_TAGS = frozenset({"scam_strong", "demand"})
+
+
+def _pattern(keyword: str) -> str:
+    escaped = re.escape(keyword)
+    if _WHOLE_WORD_TAGS.intersection(_KEYWORD_TAGS[keyword]):
+        return rf"\b{escaped}\b"
+    return escaped
+
+
+# Longest first so multi-word keywords win over their prefixes
+_KEYWORD_RE = re.compile(
+    "|".join(map(_pattern, sorted(_KEYWORD_TAGS, key=len, reverse=True))),
+    re.IGNORECASE,
+)
+
+
+def scan(text: str) -> Dict[str, List[str]]:
+    """
+    Scan text once and group matched keywords by tag.
+
+    Returns:
+        Dict mapping tag -> unique lowercase keywords in match order
+    """
+    hits: Dict[str, List[str]] = {}
+    seen = set()
+    for match in _KEYWORD_RE.findall(text):
+        keyword = match.lower()
+        if keyword in seen:
+            continue
+        seen.add(keyword)
+        for tag in _KEYWORD_TAGS[keyword]:
+            hits.setdefault(tag, []).append(keyword)
+    return hits
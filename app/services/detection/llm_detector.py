@@ -4,13 +4,61 @@ LLM Detector for Scam Detection
 This module uses LLM to make final scam judgment using RAG context.
 """
 
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Sequence
+from dataclasses import dataclass, replace
 from app.services.llm.client import get_llm_client
 from app.services.detection.rag_retriever import RAGRetrievalResult
+from app.services.detection.keywords import scan as scan_keywords
+from app.services.rag.proximity_cache import ProximityCache
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Shared, immutable values for the keyword-based verdicts
+_EMPTY: tuple = ()
+_FALLBACK_PATTERNS = ("keyword_match",)
+_FALLBACK_RED_FLAGS = ("High Urgency", "Recall LLM")
+
+# Distinct strong tells (plus a demand cue) needed to call a scam without asking the LLM
+_STRONG_KEYWORD_MIN_HITS = 2
+
+# Scam campaigns resend the same template; remember recent LLM verdicts
+_RESULT_CACHE_SIZE = 1024
+# Near-duplicates (by query embedding) reuse a scam verdict for this long.
+# Not-scam verdicts are never reused: a negated or warning rewrite of a
+# template embeds close to it, and waving one through loses a scam
+_SIMILAR_CACHE_SIZE = 4096
+_SIMILAR_CACHE_TTL = 3600.0
+
+# Normal-mode prompt around the per-request message and RAG context,
+# concatenated once at import
+_NORMAL_MODE_HEAD = 'You are a scam detection expert for India.\n\nINCOMING MESSAGE:\n"'
+_NORMAL_MODE_TAIL = """
+
+ANALYSIS FRAMEWORK:
+1. Pattern Matching: Does it match known scam patterns from the knowledge base?
+2. Legitimacy Indicators: Official domains, toll-free numbers, transaction IDs?
+3. Scam Indicators: Threats, urgency, fake domains, personal contacts?
+4. Context: Could there be a legitimate explanation?
+
+RESPOND IN JSON:
+{
+  "is_scam": true/false,
+  "confidence": 0.0-1.0,
+  "primary_category": "category_name" or null,
+  "reasoning": "2-3 sentence explanation",
+  "matched_patterns": ["pattern1", "pattern2"],
+  "red_flags": ["flag1", "flag2"],
+  "legitimacy_indicators": ["indicator1"] or []
+}
+
+Be thorough but concise. Focus on evidence from the knowledge base matches."""
+
+
+@dataclass(slots=True)
 class ScamDetectionResult:
     """
     Result of LLM scam detection.
@@ -20,19 +68,26 @@ class ScamDetectionResult:
         confidence: Confidence score (0.0 to 1.0)
         primary_category: Detected scam category (e.g., 'digital_arrest')
         reasoning: LLM's explanation (2-3 sentences)
-        matched_patterns: List of matched scam patterns
-        red_flags: List of identified red flags
-        legitimacy_indicators: List of legitimacy indicators (if any)
+        matched_patterns: Matched scam patterns
+        red_flags: Identified red flags
+        legitimacy_indicators: Legitimacy indicators (if any)
         raw_response: Raw LLM response for debugging
+        bypass_llm: True when decided by keyword rules without an LLM call
     """
     is_scam: bool
     confidence: float
     primary_category: Optional[str]
     reasoning: str
-    matched_patterns: list
-    red_flags: list
-    legitimacy_indicators: list
+    matched_patterns: Sequence[str]
+    red_flags: Sequence[str]
+    legitimacy_indicators: Sequence[str]
     raw_response: Optional[Dict[str, Any]] = None
+    bypass_llm: bool = False
+
+
+def _is_real_verdict(response: Dict[str, Any]) -> bool:
+    """True if the LLM actually answered (not an empty, error or fallback payload)."""
+    return "is_scam" in response and not response.get("error") and not response.get("fallback")
 
 
 class LLMDetector:
@@ -43,12 +98,18 @@ class LLMDetector:
     def __init__(self):
         """Initialize LLM detector"""
         self.llm_client = get_llm_client()
+        # Normalized message text -> LLM verdict, least recently used first
+        self._result_cache: "OrderedDict[str, ScamDetectionResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Query embedding -> (expires_at, RAG top category, scam verdict)
+        self._similar_cache = ProximityCache(capacity=_SIMILAR_CACHE_SIZE)
     
     def detect_normal_mode(
         self,
         message_text: str,
         rag_result: RAGRetrievalResult,
-        language: str = "en"
+        language: str = "en",
+        embedding=None
     ) -> ScamDetectionResult:
         """
         Detect scam using RAG context + LLM judgment.
@@ -57,10 +118,28 @@ class LLMDetector:
             message_text: The incoming message
             rag_result: RAG retrieval result with evidence
             language: Detected language code
+            embedding: Query embedding of the message, enables the near-duplicate cache
             
         Returns:
             ScamDetectionResult with LLM judgment
         """
+        # Repeated template (same words, different spacing/case): reuse the verdict
+        cache_key = " ".join(message_text.casefold().split())
+        with self._cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+        if cached is not None:
+            return replace(cached, raw_response={"cache_hit": True})
+        
+        # Same scam template with small edits: reuse the verdict if RAG agrees on the category
+        if embedding is not None:
+            entry = self._similar_cache.get(embedding)
+            if entry is not None:
+                expires_at, top_category, similar = entry
+                if top_category == rag_result.top_category and expires_at > time.monotonic():
+                    return replace(similar, raw_response={"similar_cache_hit": True})
+        
         # Build prompt with RAG context
         prompt = self._build_normal_mode_prompt(message_text, rag_result)
         
@@ -71,25 +150,39 @@ class LLMDetector:
             if response.get("error") or "No LLM keys configured" in str(response.get("reasoning", "")):
                  raise Exception("LLM returned error response or mock")
         except Exception as e:
-            print(f"[WARN] LLM fallback triggered: {e}")
+            logger.warning("LLM fallback triggered: %s", e)
             
             # Heuristic Fallback
-            is_scam_keywords = ["police", "arrest", "verify", "account", "blocked", "cbi", "aadhaar", "money laundering"]
-            is_scam = any(k in message_text.lower() for k in is_scam_keywords)
+            # One scan over the message; matched keywords decide the category
+            hits = scan_keywords(message_text)
+            is_scam = "scam" in hits
             
             return ScamDetectionResult(
                 is_scam=is_scam,
                 confidence=0.95 if is_scam else 0.0,
-                primary_category="digital_arrest" if "cbi" in message_text.lower() or "arrest" in message_text.lower() else "heuristic_fallback",
+                primary_category="digital_arrest" if "digital_arrest" in hits else "heuristic_fallback",
                 reasoning="LLM Failed/Mocked - Fallback to keyword matching",
-                matched_patterns=["keyword_match"] if is_scam else [],
-                red_flags=["High Urgency", "Recall LLM"] if is_scam else [],
-                legitimacy_indicators=[],
+                matched_patterns=_FALLBACK_PATTERNS if is_scam else _EMPTY,
+                red_flags=_FALLBACK_RED_FLAGS if is_scam else _EMPTY,
+                legitimacy_indicators=_EMPTY,
                 raw_response={"fallback": True}
             )
         
         # Parse and return result
-        return self._parse_llm_response(response)
+        result = self._parse_llm_response(response)
+        # An outage can yield "{}" (parsed as not-scam); only cache real verdicts
+        real_verdict = _is_real_verdict(response)
+        if real_verdict:
+            with self._cache_lock:
+                self._result_cache[cache_key] = result
+                if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+        if real_verdict and result.is_scam and embedding is not None:
+            self._similar_cache.put(
+                embedding,
+                (time.monotonic() + _SIMILAR_CACHE_TTL, rag_result.top_category, result)
+            )
+        return result
     
     def _build_normal_mode_prompt(
         self,
@@ -99,33 +192,9 @@ class LLMDetector:
         """
         Build LLM prompt with RAG context.
         """
-        prompt = f"""You are a scam detection expert for India.
-
-INCOMING MESSAGE:
-"{message_text}"
-
-{rag_result.formatted_context}
-
-ANALYSIS FRAMEWORK:
-1. Pattern Matching: Does it match known scam patterns from the knowledge base?
-2. Legitimacy Indicators: Official domains, toll-free numbers, transaction IDs?
-3. Scam Indicators: Threats, urgency, fake domains, personal contacts?
-4. Context: Could there be a legitimate explanation?
-
-RESPOND IN JSON:
-{{
-  "is_scam": true/false,
-  "confidence": 0.0-1.0,
-  "primary_category": "category_name" or null,
-  "reasoning": "2-3 sentence explanation",
-  "matched_patterns": ["pattern1", "pattern2"],
-  "red_flags": ["flag1", "flag2"],
-  "legitimacy_indicators": ["indicator1"] or []
-}}
-
-Be thorough but concise. Focus on evidence from the knowledge base matches."""
-        
-        return prompt
+        return "".join((
+            _NORMAL_MODE_HEAD, message_text, '"\n\n', rag_result.formatted_context, _NORMAL_MODE_TAIL
+        ))
     
     def _parse_llm_response(
         self,
@@ -140,15 +209,17 @@ Be thorough but concise. Focus on evidence from the knowledge base matches."""
         Returns:
             ScamDetectionResult
         """
+        get = response.get
         return ScamDetectionResult(
-            is_scam=response.get("is_scam", False),
-            confidence=float(response.get("confidence", 0.0)),
-            primary_category=response.get("primary_category"),
-            reasoning=response.get("reasoning", "No reasoning provided"),
-            matched_patterns=response.get("matched_patterns", []),
-            red_flags=response.get("red_flags", []),
-            legitimacy_indicators=response.get("legitimacy_indicators", []),
-            raw_response=response
+            is_scam=get("is_scam", False),
+            confidence=float(get("confidence", 0.0)),
+            primary_category=get("primary_category"),
+            reasoning=get("reasoning", "No reasoning provided"),
+            matched_patterns=get("matched_patterns", _EMPTY),
+            red_flags=get("red_flags", _EMPTY),
+            legitimacy_indicators=get("legitimacy_indicators", _EMPTY),
+            # Only keep the raw payload around when someone will read it
+            raw_response=response if logger.isEnabledFor(logging.DEBUG) else None
         )
 
 
@@ -157,6 +228,7 @@ Be thorough but concise. Focus on evidence from the knowledge base matches."""
 # ============================================================
 
 _llm_detector: Optional[LLMDetector] = None
+_llm_detector_lock = threading.Lock()
 
 
 def get_llm_detector() -> LLMDetector:
@@ -168,7 +240,10 @@ def get_llm_detector() -> LLMDetector:
     """
     global _llm_detector
     if _llm_detector is None:
-        _llm_detector = LLMDetector()
+        # Detection runs in worker threads; construct only once
+        with _llm_detector_lock:
+            if _llm_detector is None:
+                _llm_detector = LLMDetector()
     return _llm_detector
 
 
@@ -176,10 +251,44 @@ def get_llm_detector() -> LLMDetector:
 # Convenience Functions
 # ============================================================
 
+def detect_strong_keywords(
+    message_text: str,
+    hits: Optional[Dict[str, list]] = None
+) -> Optional[ScamDetectionResult]:
+    """
+    Decide unambiguous scams from keyword tells alone.
+    
+    Args:
+        message_text: The incoming message
+        hits: Keyword scan of message_text, if the caller already has one
+        
+    Returns:
+        ScamDetectionResult if enough strong keywords and a demand cue matched, else None
+    """
+    if hits is None:
+        hits = scan_keywords(message_text)
+    strong = hits.get("scam_strong", [])
+    # Warnings and news mention the same terms; only an actual demand makes it unambiguous
+    if len(strong) < _STRONG_KEYWORD_MIN_HITS or "demand" not in hits:
+        return None
+    
+    return ScamDetectionResult(
+        is_scam=True,
+        confidence=0.97,
+        primary_category="digital_arrest" if "digital_arrest" in hits else "heuristic_keywords",
+        reasoning=f"Strong scam keywords matched: {', '.join(strong)}",
+        matched_patterns=strong,
+        red_flags=hits["scam"],
+        legitimacy_indicators=_EMPTY,
+        bypass_llm=True
+    )
+
+
 def detect_scam_normal_mode(
     message_text: str,
     rag_result: RAGRetrievalResult,
-    language: str = "en"
+    language: str = "en",
+    embedding=None
 ) -> ScamDetectionResult:
     """
     Turn-key function for detection.
@@ -188,9 +297,10 @@ def detect_scam_normal_mode(
         message_text: The incoming message
         rag_result: RAG retrieval result
         language: Detected language
+        embedding: Query embedding of the message, if already computed
         
     Returns:
         ScamDetectionResult
     """
     detector = get_llm_detector()
-    return detector.detect_normal_mode(message_text, rag_result, language)
+    return detector.detect_normal_mode(message_text, rag_result, language, embedding)
@@ -12,8 +12,13 @@ Changes:
 - SIMPLIFIED: Single detection path
 """
 
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any
+import asyncio
+import functools
+import logging
+import sys
+import time
+import settings
 
 from app.models.schemas import MessageRequest
 from app.models.session import SessionData
@@ -21,9 +26,19 @@ from app.services.session.manager import get_session_manager
 
 # Phase 2 Components
 from app.services.detection.pre_screen import pre_screen_message
-from app.services.detection.rag_retriever import retrieve_rag_evidence
-from app.services.detection.llm_detector import detect_scam_normal_mode
-from app.services.detection.decision_maker import make_final_decision, FinalDecision
+from app.services.detection.keywords import scan as scan_keywords
+from app.services.detection.rag_retriever import (
+    embed_message_async,
+    retrieve_rag_evidence_by_embedding_async,
+    empty_rag_result,
+)
+from app.services.detection.llm_detector import detect_scam_normal_mode, detect_strong_keywords
+from app.services.detection.decision_maker import make_final_decision, FinalDecision, SCAM_ACTIONS
+
+logger = logging.getLogger(__name__)
+
+# Messages of at most this many words with no keyword hit skip RAG retrieval
+_TRIVIAL_MAX_WORDS = 3
 
 
 class DetectionPipeline:
@@ -36,54 +51,75 @@ class DetectionPipeline:
         """Initialize pipeline"""
         self.session_manager = get_session_manager()
 
-    async def process(self, request: MessageRequest) -> Dict[str, Any]:
+    async def process(self, request: MessageRequest, session: SessionData) -> Dict[str, Any]:
         """
         Process an incoming message through the detection pipeline.
 
         Args:
             request: Incoming message request
+            session: Session the caller already loaded (or created) for request.sessionId
 
         Returns:
-            Dict containing pipeline results and action
+            Dict containing pipeline results, action and the updated session
         """
         message_text = request.message.text
         session_id = request.sessionId
 
-        # Get or create session
-        session = self.session_manager.get_session(session_id)
-        if not session:
-            session = self.session_manager.create_session(session_id)
+        if session.scam_detected:
+            # Already flagged (e.g. a concurrent turn finished detection first):
+            # don't pay for RAG + LLM again
+            return {"action": "engage", "reason": "already detected", "session": session}
 
-        print(f"\n--- Detection Pipeline: {session_id} ---")
-        print(f"Message: {message_text[:50]}...")
+        logger.debug("Detection pipeline: %s, message: %.50s...", session_id, message_text)
 
         # ----------------------------------------------------
         # Step 1: Pre-Screening (Null/Empty checks)
         # ----------------------------------------------------
         screen_result = pre_screen_message(request)
         if not screen_result.passed:
-            print(f"[Pipeline] Pre-screening rejected: {screen_result.reason}")
-            return {"action": "ignore", "reason": screen_result.reason}
+            logger.debug("Pre-screening rejected: %s", screen_result.reason)
+            return {"action": "ignore", "reason": screen_result.reason, "session": session}
 
         # ----------------------------------------------------
         # Step 2: RAG + LLM Detection
         # ----------------------------------------------------
-        # Retrieve RAG evidence
-        rag_result = retrieve_rag_evidence(message_text)
-        print(f"[Pipeline] RAG: {len(rag_result.matches)} matches found")
-
-        # Run LLM detection with RAG context (language defaulted to 'en')
-        detection_result = detect_scam_normal_mode(
-            message_text, rag_result, "en"
+        # One keyword scan feeds both shortcuts below
+        keyword_hits = scan_keywords(message_text)
+
+        # Unambiguous tells (e.g. CBI + money laundering) skip RAG and the LLM
+        detection_result = detect_strong_keywords(message_text, keyword_hits)
+        if detection_result is None:
+            embedding = None
+            if not keyword_hits and len(message_text.split()) <= _TRIVIAL_MAX_WORDS:
+                # Greetings and pings: the knowledge base has nothing to add
+                rag_result = empty_rag_result(message_text)
+                logger.debug("RAG: skipped for trivial message")
+            else:
+                # Embed once; the vector is reused by every step that needs it
+                embedding = await embed_message_async(message_text)
+
+                # Retrieve RAG evidence
+                rag_result = await retrieve_rag_evidence_by_embedding_async(message_text, embedding)
+                logger.debug("RAG: %d matches found", len(rag_result.matches))
+
+            # Run LLM detection with RAG context (language defaulted to 'en').
+            # The LLM client is blocking; run it in a worker so other requests proceed.
+            detection_result = await asyncio.to_thread(
+                detect_scam_normal_mode, message_text, rag_result, "en", embedding
+            )
+        else:
+            logger.debug("Strong keyword match, LLM skipped")
+
+        logger.debug(
+            "LLM: is_scam=%s, conf=%.2f, bypass_llm=%s",
+            detection_result.is_scam, detection_result.confidence, detection_result.bypass_llm
         )
 
-        print(f"[Pipeline] LLM: is_scam={detection_result.is_scam}, conf={detection_result.confidence:.2f}")
-
         # ----------------------------------------------------
         # Step 3: Decision Making
         # ----------------------------------------------------
         final_decision = make_final_decision(detection_result)
-        print(f"[Pipeline] Decision: {final_decision.action.upper()}")
+        logger.debug("Decision: %s", final_decision.action)
 
         # ----------------------------------------------------
         # Step 4: Update Session
@@ -98,13 +134,14 @@ class DetectionPipeline:
         # Return Result
         # ----------------------------------------------------
         if final_decision.action == "ignore":
-            return {"action": "ignore", "decision": final_decision}
+            return {"action": "ignore", "decision": final_decision, "session": session}
 
         # If ENGAGE or PROBE, main loop will trigger engagement phase
         return {
             "action": final_decision.action,
             "decision": final_decision,
-            "session_id": session_id
+            "session_id": session_id,
+            "session": session
         }
 
     async def _update_session_with_decision(
@@ -116,51 +153,48 @@ class DetectionPipeline:
         """
         Update session with detection results.
         """
-        # Add message to history
-        session.conversation_history.append({
-            "role": "user",
-            "content": message_text,
-            "timestamp": datetime.now().isoformat()
-        })
+        # One clock read for the history entry and the session timestamp
+        now = time.time()
+
+        # Add message to history (sliding window keeps session payloads bounded)
+        session.log.append("user", message_text, limit=settings.SESSION_HISTORY_LIMIT, timestamp=now)
         session.turn_count += 1
 
-        if decision.action in ["engage", "probe"]:
+        if decision.action in SCAM_ACTIONS:
             # Valid detection - update session metadata
             session.scam_detected = True
             session.stage = "engagement"
-            session.updated_at = datetime.now()
 
             # Store metadata
             session.detected_language = "en"
             session.language_confidence = 1.0
 
-            session.category = decision.category
+            session.category = sys.intern(decision.category) if decision.category else decision.category
             session.confidence = decision.confidence
             session.reasoning = decision.reasoning
             session.red_flags = decision.red_flags
 
-            print("[Pipeline] Session updated with scam indicators")
+            logger.debug("Session updated with scam indicators")
 
-        # Save session
-        self.session_manager.update_session(session)
+        # Save session (stamps updated_at)
+        self.session_manager.update_session(session, now)
 
 
 # ============================================================
 # Global Singleton Instance
 # ============================================================
 
-_pipeline: Optional[DetectionPipeline] = None
-
-
+@functools.cache
 def get_detection_pipeline() -> DetectionPipeline:
     """Get or create global pipeline instance"""
-    global _pipeline
-    if _pipeline is None:
-        _pipeline = DetectionPipeline()
-    return _pipeline
+    return DetectionPipeline()
 
 
 async def run_detection_pipeline(request: MessageRequest) -> Dict[str, Any]:
     """Convenience function to run pipeline"""
     pipeline = get_detection_pipeline()
-    return await pipeline.process(request)
+    session_manager = pipeline.session_manager
+    session = await session_manager.get_session_async(request.sessionId)
+    if not session:
+        session = session_manager.create_session(request.sessionId)
+    return await pipeline.process(request, session)
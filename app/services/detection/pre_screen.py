@@ -10,20 +10,24 @@ everything else to proceed to the full detection pipeline.
 """
 
 from typing import Optional, Dict, Any
+from dataclasses import dataclass
 from app.models.schemas import Message, MessageRequest
 
 
+@dataclass(slots=True)
 class PreScreenResult:
     """Result of pre-screening validation"""
-    
-    def __init__(self, passed: bool, reason: Optional[str] = None):
-        self.passed = passed
-        self.reason = reason
+    passed: bool
+    reason: Optional[str] = None
     
     def __bool__(self):
         return self.passed
 
 
+# Every passing message gets the same (never mutated) result
+_PASSED = PreScreenResult(True)
+
+
 class PreScreenFilter:
     """
     Minimal pre-screening filter for incoming messages.
@@ -51,27 +55,29 @@ class PreScreenFilter:
         """
         
         # Check 1: message == null
-        if request.message is None:
+        message = request.message
+        if message is None:
             return PreScreenResult(False, "message is null")
         
         # Check 2: message.text == null
-        if request.message.text is None:
+        text = message.text
+        if text is None:
             return PreScreenResult(False, "message.text is null")
         
         # Check 3: typeof(message.text) != string
-        if not isinstance(request.message.text, str):
-            return PreScreenResult(False, f"message.text is not a string (type: {type(request.message.text).__name__})")
+        if not isinstance(text, str):
+            return PreScreenResult(False, f"message.text is not a string (type: {type(text).__name__})")
         
         # Check 4: message.text == ""
-        if request.message.text == "":
+        if not text:
             return PreScreenResult(False, "message.text is empty string")
         
-        # Check 5: message.text.strip() == ""
-        if request.message.text.strip() == "":
+        # Check 5: message.text.strip() == "" (isspace scans in C without copying)
+        if text.isspace():
             return PreScreenResult(False, "message.text is whitespace only")
         
         # All checks passed
-        return PreScreenResult(True)
+        return _PASSED
     
     @staticmethod
     def should_ignore(request: MessageRequest) -> tuple[bool, Optional[str]]:
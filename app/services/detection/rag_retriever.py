@@ -1,12 +1,16 @@
 """
 RAG Retriever - FIXED to use vector_store.search()
 """
+import functools
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from app.services.rag.vector_store import get_vector_store
+from app.services.rag.proximity_cache import ProximityCache
 
+_NO_MATCHES_CONTEXT = "Knowledge Base: None found"
 
-@dataclass
+
+@dataclass(slots=True)
 class RAGMatch:
     id: str
     category: str
@@ -25,76 +29,137 @@ class RAGMatch:
             return "LOW"
 
 
-@dataclass
+def _format_context(matches: List[RAGMatch]) -> str:
+    if not matches:
+        return _NO_MATCHES_CONTEXT
+    
+    lines = ["KNOWLEDGE BASE MATCHES:"]
+    for i, match in enumerate(matches, 1):
+        lines.append(f"\nMatch #{i} (Similarity: {match.similarity:.2f} - {match.similarity_level}):")
+        lines.append(f"• Category: {match.category}")
+        lines.append(f"• Pattern: {match.pattern}")
+    
+    return "\n".join(lines)
+
+
+@dataclass(slots=True)
 class RAGRetrievalResult:
     query: str
     matches: List[RAGMatch]
-    formatted_context: str
     top_category: Optional[str]
     has_high_similarity: bool
+    _context: Optional[str] = field(default=None, repr=False)
+    
+    @property
+    def formatted_context(self) -> str:
+        """Prompt-ready text of the matches, built on first use (LLM cache hits never need it)."""
+        if self._context is None:
+            self._context = _format_context(self.matches)
+        return self._context
 
 
 class RAGRetriever:
     def __init__(self, top_k: int = 5):
         self.top_k = top_k
         self.vector_store = get_vector_store()
+        # Near-duplicate queries (same scam template) reuse an earlier result; default k only
+        self._cache = ProximityCache()
     
     def retrieve(self, message_text: str, top_k: Optional[int] = None) -> RAGRetrievalResult:
         k = top_k or self.top_k
         
-        # FIXED: Use search() method
-        raw_results = self.vector_store.search(message_text, top_k=k)
+        embedding = self.vector_store.encode_query(message_text)
+        cached = self._cache_get(embedding, message_text, k)
+        if cached is not None:
+            return cached
+        
+        raw_results = self.vector_store.search_by_embedding(message_text, embedding, top_k=k)
+        return self._cache_put(embedding, k, self._build_result(message_text, raw_results))
+    
+    async def retrieve_by_embedding_async(
+        self,
+        message_text: str,
+        embedding,
+        top_k: Optional[int] = None
+    ) -> RAGRetrievalResult:
+        """Async retrieve for a message the caller has already embedded (see embed_message_async)."""
+        k = top_k or self.top_k
+        
+        cached = self._cache_get(embedding, message_text, k)
+        if cached is not None:
+            return cached
         
+        raw_results = await self.vector_store.search_by_embedding_async(message_text, embedding, top_k=k)
+        return self._cache_put(embedding, k, self._build_result(message_text, raw_results))
+    
+    def _cache_get(self, embedding, message_text: str, k: int) -> Optional[RAGRetrievalResult]:
+        if k != self.top_k:
+            return None
+        cached = self._cache.get(embedding)
+        return replace(cached, query=message_text) if cached is not None else None
+    
+    def _cache_put(self, embedding, k: int, result: RAGRetrievalResult) -> RAGRetrievalResult:
+        if k == self.top_k:
+            self._cache.put(embedding, result)
+        return result
+    
+    def _build_result(self, message_text: str, raw_results: List[Dict[str, Any]]) -> RAGRetrievalResult:
+        # One pass: build matches and track the high-similarity flag as we go
         matches = []
+        has_high_similarity = False
         for result in raw_results:
             metadata = result.get("metadata", {})
-            text = result.get("text", "")
-            distance = result.get("distance", 1.0)
-            similarity = max(0.0, 1.0 - distance)
+            meta = metadata.get
+            similarity = max(0.0, 1.0 - result.get("distance", 1.0))
+            if similarity >= 0.85:
+                has_high_similarity = True
+            category = meta("category", "unknown")
             
-            match = RAGMatch(
-                id=metadata.get("id", "unknown"),
-                category=metadata.get("category", "unknown"),
-                scam_type=metadata.get("scam_type", metadata.get("category", "unknown")),
-                pattern=text[:200],
+            matches.append(RAGMatch(
+                id=meta("id", "unknown"),
+                category=category,
+                scam_type=meta("scam_type", category),
+                pattern=result.get("text", "")[:200],
                 similarity=similarity,
-                intent=metadata.get("intent", "Scam activity")
-            )
-            matches.append(match)
+                intent=meta("intent", "Scam activity")
+            ))
         
-        formatted_context = self._format_context(matches)
         top_category = matches[0].category if matches else None
-        has_high_similarity = any(m.similarity >= 0.85 for m in matches)
         
         return RAGRetrievalResult(
             query=message_text,
             matches=matches,
-            formatted_context=formatted_context,
             top_category=top_category,
             has_high_similarity=has_high_similarity
         )
-    
-    def _format_context(self, matches: List[RAGMatch]) -> str:
-        if not matches:
-            return "Knowledge Base: None found"
-        
-        lines = ["KNOWLEDGE BASE MATCHES:"]
-        for i, match in enumerate(matches, 1):
-            lines.append(f"\nMatch #{i} (Similarity: {match.similarity:.2f} - {match.similarity_level}):")
-            lines.append(f"• Category: {match.category}")
-            lines.append(f"• Pattern: {match.pattern}")
-        
-        return "\n".join(lines)
 
 
-_rag_retriever: Optional[RAGRetriever] = None
+def empty_rag_result(message_text: str) -> RAGRetrievalResult:
+    """Result used when retrieval is skipped for a message."""
+    return RAGRetrievalResult(
+        query=message_text,
+        matches=[],
+        top_category=None,
+        has_high_similarity=False
+    )
+
 
 def get_rag_retriever(top_k: int = 5) -> RAGRetriever:
-    global _rag_retriever
-    if _rag_retriever is None:
-        _rag_retriever = RAGRetriever(top_k=top_k)
-    return _rag_retriever
+    # Positional, so get_rag_retriever() and get_rag_retriever(top_k=5) share an instance
+    return _rag_retriever_for(top_k)
+
+@functools.cache
+def _rag_retriever_for(top_k: int) -> RAGRetriever:
+    return RAGRetriever(top_k=top_k)
 
 def retrieve_rag_evidence(message: str, top_k: int = 5) -> RAGRetrievalResult:
     retriever = get_rag_retriever(top_k=top_k)
-    return retriever.retrieve(message, top_k=top_k)
\ No newline at end of file
+    return retriever.retrieve(message, top_k=top_k)
+
+async def embed_message_async(message: str):
+    """Query embedding for a message, computed once and reusable across pipeline steps."""
+    return await get_vector_store().encode_query_async(message)
+
+async def retrieve_rag_evidence_by_embedding_async(message: str, embedding, top_k: int = 5) -> RAGRetrievalResult:
+    retriever = get_rag_retriever(top_k=top_k)
+    return await retriever.retrieve_by_embedding_async(message, embedding, top_k=top_k)
\ No newline at end of file
@@ -3,6 +3,7 @@ Adaptive Engagement Agent - Orchestrates dynamic, intelligent conversation flow
 Uses content-based states, goal-oriented extraction, and natural responses
 """
 import asyncio
+import logging
 from typing import Dict, Any, List, Optional
 from app.models.session import SessionData
 from app.services.engagement.persona_selector import DynamicPersonaGenerator
@@ -14,8 +15,11 @@ from app.services.engagement.stop_checker import StopConditionChecker
 from app.services.intelligence.investigator import InvestigatorAgent
 from app.services.llm.client import get_engagement_llm
 from app.services.finalization.guvi_callback import GUVICallbackClient
+from app.services.finalization.report_builder import map_intel_to_schema
 import settings
 
+logger = logging.getLogger(__name__)
+
 
 class EngagementAgent:
     """
@@ -45,20 +49,19 @@ class EngagementAgent:
         9. Handle completion/reporting
         """
         
-        print(f"\n{'='*50}")
-        print(f"[Agent] Turn {session.turn_count + 1} - Processing message...")
-        print(f"{'='*50}")
+        logger.debug("Turn %s - Processing message...", session.turn_count + 1)
         
         # ============================================
         # 1. ANALYZE SCAMMER BEHAVIOR (Fast, no LLM)
         # ============================================
-        scammer_tone = ScammerBehaviorAnalyzer.analyze_tone(message_text)
-        is_urgent = ScammerBehaviorAnalyzer.detect_urgency(message_text)
-        has_threat = ScammerBehaviorAnalyzer.detect_threat(message_text)
-        payment_info = ScammerBehaviorAnalyzer.detect_payment_info_given(message_text)
+        message_lower = message_text.lower()
+        scammer_tone = ScammerBehaviorAnalyzer.analyze_tone(message_text, message_lower)
+        is_urgent = ScammerBehaviorAnalyzer.detect_urgency(message_text, message_lower)
+        has_threat = ScammerBehaviorAnalyzer.detect_threat(message_text, message_lower)
+        payment_info = ScammerBehaviorAnalyzer.detect_payment_info_given(message_text, message_lower)
         
-        print(f"[Agent] Scammer tone: {scammer_tone}, Urgent: {is_urgent}, Threat: {has_threat}")
-        print(f"[Agent] Payment info in message: {payment_info}")
+        logger.debug("Scammer tone: %s, Urgent: %s, Threat: %s", scammer_tone, is_urgent, has_threat)
+        logger.debug("Payment info in message: %s", payment_info)
         
         # ============================================
         # 2. UPDATE TURN COUNT
@@ -80,7 +83,7 @@ class EngagementAgent:
         )
         session.stage = conversation_state  # Update session with current state
         
-        print(f"[Agent] Conversation state: {conversation_state}")
+        logger.debug("Conversation state: %s", conversation_state)
         
         # ============================================
         # 4. GET EXTRACTION GOAL (from EXISTING intel)
@@ -91,8 +94,8 @@ class EngagementAgent:
         )
         next_goal = extraction_progress.get("next_goal")
         
-        print(f"[Agent] Extraction progress: {extraction_progress['percentage']:.0f}%")
-        print(f"[Agent] Next goal: {next_goal}")
+        logger.debug("Extraction progress: %.0f%%", extraction_progress['percentage'])
+        logger.debug("Next goal: %s", next_goal)
         
         # ============================================
         # 5. GENERATE ADAPTIVE PERSONA
@@ -107,7 +110,8 @@ class EngagementAgent:
         # Store persona name in session for tracking
         session.persona = persona_traits.get("character_summary", "Adaptive Persona")
         
-        print(f"[Agent] Persona: {persona_traits.get('primary_emotion')} / {persona_traits.get('compliance_style', '')[:30]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Persona: %s / %s", persona_traits.get('primary_emotion'), persona_traits.get('compliance_style', '')[:30])
         
         # ============================================
         # 6. CHECK STOP CONDITIONS
@@ -116,7 +120,7 @@ class EngagementAgent:
         if should_stop or session.turn_count >= settings.MAX_TURNS:
             conversation_state = "exhaustion_stalling"
             session.stage = "termination"
-            print(f"[Agent] Stop condition triggered - entering termination")
+            logger.debug("Stop condition triggered - entering termination")
         
         # ============================================
         # 7. BUILD INTELLIGENT PROMPT
@@ -130,7 +134,7 @@ class EngagementAgent:
         # ============================================
         # 8. PARALLEL: Investigator + LLM Response
         # ============================================
-        print(f"[Agent] Running Investigator + LLM in parallel...")
+        logger.debug("Running Investigator + LLM in parallel...")
         
         async def run_investigator():
             """Extract intelligence from scammer's message"""
@@ -140,7 +144,7 @@ class EngagementAgent:
                     conversation_history=history
                 )
             except Exception as e:
-                print(f"[Agent] Investigator error: {e}")
+                logger.warning("Investigator error: %s", e)
                 return {}
 
         async def run_llm_response():
@@ -155,7 +159,7 @@ class EngagementAgent:
                     150    # max_tokens
                 )
             except Exception as e:
-                print(f"[Agent] LLM error: {e}")
+                logger.warning("LLM error: %s", e)
                 return None
 
         # Run both in parallel
@@ -171,14 +175,16 @@ class EngagementAgent:
             # Investigator returns intel directly (not wrapped in "intelligence" key)
             new_intel = {k: v for k, v in investigator_result.items() if not k.startswith("_")}
             intel_count = sum(len(v) if isinstance(v, list) else 1 for v in new_intel.values() if v)
-            print(f"[Agent] Extracted {intel_count} new intel items: {[k for k,v in new_intel.items() if v]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Extracted %s new intel items: %s", intel_count, [k for k,v in new_intel.items() if v])
 
             if intel_count > 0:
                 session.extracted_intel = InvestigatorAgent.merge_intel(
                     existing=session.extracted_intel,
                     new_intel=new_intel
                 )
-                print(f"[Agent] Session intel after merge: {[k for k,v in session.extracted_intel.items() if v]}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Session intel after merge: %s", [k for k,v in session.extracted_intel.items() if v])
         
         # ============================================
         # 10. PROCESS LLM REPLY
@@ -216,13 +222,14 @@ class EngagementAgent:
                     reply_text = '.'.join(truncated) + '.'
                 else:
                     reply_text = ' '.join(reply_text.split()[:35]) + '...'
-                print(f"[Agent] Response trimmed from {word_count} to {len(reply_text.split())} words")
+                logger.debug("Response trimmed from %s to %s words", word_count, len(reply_text.split()))
             
-            print(f"[Agent] Generated reply ({len(reply_text.split())} words): {reply_text[:80]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Generated reply (%s words): %s...", len(reply_text.split()), reply_text[:80])
         
         else:
             # Context-aware fallback based on scammer tone
-            print(f"[Agent] LLM failed, using fallback reply")
+            logger.warning("LLM failed, using fallback reply")
             if scammer_tone == "aggressive":
                 reply_text = "ok ok im trying plz wait"
             elif has_threat:
@@ -235,7 +242,7 @@ class EngagementAgent:
         # ============================================
         if session.stage == "termination" or should_stop:
             if not getattr(session, "reported_to_guvi", False):
-                print(f"[Agent] Conversation ending. Reporting to GUVI...")
+                logger.info("Conversation ending. Reporting to GUVI...")
                 
                 notes = f"Category: {session.category}. "
                 notes += f"Turns: {session.turn_count}. "
@@ -254,10 +261,12 @@ class EngagementAgent:
                     
                     if success:
                         session.reported_to_guvi = True
-                        print(f"[Agent] Successfully reported to GUVI")
+                        # Intel is frozen from here on; closed turns reuse this
+                        session.closed_intel = map_intel_to_schema(session.extracted_intel, session.red_flags)
+                        logger.info("Successfully reported to GUVI")
                 except Exception as e:
-                    print(f"[Agent] GUVI reporting error: {e}")
+                    logger.warning("GUVI reporting error: %s", e)
         
-        print(f"[Agent] Turn {session.turn_count} complete\n")
+        logger.debug("Turn %s complete", session.turn_count)
         
         return reply_text
\ No newline at end of file
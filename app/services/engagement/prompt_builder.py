@@ -7,6 +7,7 @@ from .scammer_analyzer import ScammerBehaviorAnalyzer
 from .goal_tracker import ExtractionGoalTracker
 from .stage_manager import ConversationStateAnalyzer
 from .persona_selector import DynamicPersonaGenerator
+from .anti_detection import get_analyzer
 
 
 class AdaptivePromptBuilder:
@@ -103,8 +104,11 @@ Write a natural response (5-30 words). No quotation marks. Just your reply:"""
         """
 
         # 1. Analyze scammer's behavior
-        scammer_tone = ScammerBehaviorAnalyzer.analyze_tone(latest_message)
-        last_exchange_summary = ScammerBehaviorAnalyzer.summarize_last_exchange(history, latest_message)
+        latest_lower = latest_message.lower()
+        scammer_tone = ScammerBehaviorAnalyzer.analyze_tone(latest_message, latest_lower)
+        last_exchange_summary = ScammerBehaviorAnalyzer.summarize_last_exchange(
+            history, latest_message, tone=scammer_tone, message_lower=latest_lower
+        )
 
         # 2. Determine conversation state (content-based, not turn-based)
         conversation_state = ConversationStateAnalyzer.determine_state(
@@ -140,7 +144,6 @@ Write a natural response (5-30 words). No quotation marks. Just your reply:"""
         )
 
         # 5. Get anti-detection instructions
-        from .anti_detection import get_analyzer
         analyzer = get_analyzer()
         analysis = analyzer.analyze_history(history)
         avoidance = analyzer.generate_avoidance_instructions(analysis)
@@ -6,6 +6,11 @@ from typing import Dict, List, Optional
 import re
 
 
+def _any_of(phrases: List[str]) -> "re.Pattern[str]":
+    """One compiled alternation; search() is True if any phrase is a substring"""
+    return re.compile("|".join(map(re.escape, phrases)))
+
+
 class ScammerBehaviorAnalyzer:
     """Analyzes scammer's messages to determine their tone and behavior"""
     
@@ -39,13 +44,32 @@ class ScammerBehaviorAnalyzer:
         "bank", "ifsc", "neft", "rtgs", "imps"
     ]
     
+    # Phrases indicating manufactured urgency
+    URGENCY_PHRASES = [
+        "immediately", "right now", "urgent", "hurry",
+        "last chance", "final", "only", "today", "now or"
+    ]
+    
+    # Phrases indicating threats
+    THREAT_PHRASES = [
+        "arrest", "jail", "police", "court", "warrant",
+        "legal action", "case", "fir", "complaint",
+        "block", "freeze", "suspend", "terminate"
+    ]
+    
+    # Single-pass matchers for the any-of checks (message is lowercased first)
+    _PAYMENT_RE = _any_of(PAYMENT_KEYWORDS)
+    _URGENCY_RE = _any_of(URGENCY_PHRASES)
+    _THREAT_RE = _any_of(THREAT_PHRASES)
+    
     @classmethod
-    def analyze_tone(cls, message: str) -> str:
+    def analyze_tone(cls, message: str, message_lower: Optional[str] = None) -> str:
         """
         Analyze the scammer's tone from their message.
         Returns: "aggressive", "patient", "frustrated", or "neutral"
         """
-        message_lower = message.lower()
+        if message_lower is None:
+            message_lower = message.lower()
         
         # Count keyword matches
         aggressive_count = sum(1 for kw in cls.AGGRESSIVE_KEYWORDS if kw in message_lower)
@@ -76,36 +100,31 @@ class ScammerBehaviorAnalyzer:
             return "neutral"
     
     @classmethod
-    def detect_urgency(cls, message: str) -> bool:
+    def detect_urgency(cls, message: str, message_lower: Optional[str] = None) -> bool:
         """Check if the scammer is creating urgency"""
-        message_lower = message.lower()
-        urgency_phrases = [
-            "immediately", "right now", "urgent", "hurry",
-            "last chance", "final", "only", "today", "now or"
-        ]
-        return any(phrase in message_lower for phrase in urgency_phrases)
+        if message_lower is None:
+            message_lower = message.lower()
+        return cls._URGENCY_RE.search(message_lower) is not None
     
     @classmethod
-    def detect_payment_request(cls, message: str) -> bool:
+    def detect_payment_request(cls, message: str, message_lower: Optional[str] = None) -> bool:
         """Check if the scammer is requesting payment"""
-        message_lower = message.lower()
-        return any(kw in message_lower for kw in cls.PAYMENT_KEYWORDS)
+        if message_lower is None:
+            message_lower = message.lower()
+        return cls._PAYMENT_RE.search(message_lower) is not None
     
     @classmethod
-    def detect_threat(cls, message: str) -> bool:
+    def detect_threat(cls, message: str, message_lower: Optional[str] = None) -> bool:
         """Check if the scammer is making threats"""
-        message_lower = message.lower()
-        threat_phrases = [
-            "arrest", "jail", "police", "court", "warrant",
-            "legal action", "case", "fir", "complaint",
-            "block", "freeze", "suspend", "terminate"
-        ]
-        return any(phrase in message_lower for phrase in threat_phrases)
+        if message_lower is None:
+            message_lower = message.lower()
+        return cls._THREAT_RE.search(message_lower) is not None
     
     @classmethod
-    def detect_payment_info_given(cls, message: str) -> Dict[str, bool]:
+    def detect_payment_info_given(cls, message: str, message_lower: Optional[str] = None) -> Dict[str, bool]:
         """Check what payment info the scammer provided in the message"""
-        message_lower = message.lower()
+        if message_lower is None:
+            message_lower = message.lower()
         
         return {
             "has_upi": bool(re.search(r'[a-zA-Z0-9_.+-]+@[a-zA-Z]+', message)),
@@ -115,15 +134,24 @@ class ScammerBehaviorAnalyzer:
         }
     
     @classmethod
-    def summarize_last_exchange(cls, history: List[Dict[str, str]], last_message: str) -> str:
+    def summarize_last_exchange(
+        cls,
+        history: List[Dict[str, str]],
+        last_message: str,
+        tone: Optional[str] = None,
+        message_lower: Optional[str] = None
+    ) -> str:
         """Create a summary of what just happened in the conversation"""
         
-        # Analyze the latest message
-        tone = cls.analyze_tone(last_message)
-        has_urgency = cls.detect_urgency(last_message)
-        has_threat = cls.detect_threat(last_message)
-        has_payment_request = cls.detect_payment_request(last_message)
-        payment_info = cls.detect_payment_info_given(last_message)
+        # Analyze the latest message (lowercased once for every check)
+        if message_lower is None:
+            message_lower = last_message.lower()
+        if tone is None:
+            tone = cls.analyze_tone(last_message, message_lower)
+        has_urgency = cls.detect_urgency(last_message, message_lower)
+        has_threat = cls.detect_threat(last_message, message_lower)
+        has_payment_request = cls.detect_payment_request(last_message, message_lower)
+        payment_info = cls.detect_payment_info_given(last_message, message_lower)
         
         # Build summary
         summary_parts = []
@@ -1,5 +1,5 @@
 import httpx
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 import logging
 import settings
 
@@ -13,7 +13,7 @@ class GUVICallbackClient:
         scam_detected: bool,
         message_count: int,
         intel: Dict[str, Any],
-        red_flags: List[str],
+        red_flags: Sequence[str],
         notes: str
     ) -> bool:
         """
@@ -26,7 +26,7 @@ class GUVICallbackClient:
             "upiIds": intel.get("upiIds", []),
             "phishingLinks": intel.get("phishingLinks", []),
             "phoneNumbers": intel.get("phoneNumbers", []),
-            "suspiciousKeywords": red_flags + intel.get("suspiciousKeywords", [])
+            "suspiciousKeywords": [*red_flags, *intel.get("suspiciousKeywords", [])]
         }
         
         payload = {
@@ -1,6 +1,26 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Sequence
+from app.models.schemas import ExtractedIntelligence
 from app.models.session import SessionData
-from datetime import datetime
+import time
+
+# suspiciousKeywords is always rebuilt from red flags, never copied
+_INTEL_FIELDS = frozenset(ExtractedIntelligence.model_fields) - {"suspiciousKeywords"}
+
+
+def map_intel_to_schema(session_intel: Dict[str, Any], red_flags: Sequence[str]) -> ExtractedIntelligence:
+    """
+    Maps AI-extracted intelligence to GUVI schema format.
+    
+    The investigator already emits schema field names, so matching keys are
+    copied straight across and validation is skipped.
+    """
+    data = {k: session_intel[k] for k in session_intel.keys() & _INTEL_FIELDS}
+    
+    # Combine red flags with any extracted keywords
+    data["suspiciousKeywords"] = [*red_flags, *session_intel.get("keywords", [])]
+    
+    return ExtractedIntelligence.model_construct(**data)
+
 
 class ReportBuilder:
     
@@ -12,7 +32,7 @@ class ReportBuilder:
         """
         
         # Calculate durations
-        duration_seconds = int((datetime.now() - session.created_at).total_seconds())
+        duration_seconds = int(time.time() - session.created_at)
         total_messages = session.turn_count * 2
         
         # Assemble Report - EXACT evaluation format
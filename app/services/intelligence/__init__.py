@@ -4,6 +4,12 @@ Intelligence Extraction Module
 This module contains AI-powered intelligence extraction.
 All extraction is done via LLM for context-aware results.
 """
-from app.services.intelligence.investigator import InvestigatorAgent
-
 __all__ = ['InvestigatorAgent']
+
+
+def __getattr__(name):
+    # Lazy re-export: importing a sibling submodule doesn't pull in InvestigatorAgent's deps
+    if name == 'InvestigatorAgent':
+        from app.services.intelligence.investigator import InvestigatorAgent
+        return InvestigatorAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
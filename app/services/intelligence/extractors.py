@@ -13,14 +13,25 @@ class IntelExtractor:
         "meeting_id": re.compile(r"(?:meeting|zoom|id)[:\s-]+(\d{3,}[-\s]?\d{3,}[-\s]?\d{3,})", re.IGNORECASE)
     }
 
+    # Literal every match must contain - lets extract_all skip whole scans
+    REQUIRED_LITERALS = {"upi_id": "@", "email": "@", "url": "://"}
+    DIGIT_PATTERNS = frozenset({"phone_number", "bank_account", "ifsc", "meeting_id"})
+    _DIGIT = re.compile(r"\d")
+
     @classmethod
     def extract_all(cls, text: str) -> Dict[str, Any]:
         results = {}
+        has_digit = cls._DIGIT.search(text) is not None
         for key, pattern in cls.PATTERNS.items():
+            literal = cls.REQUIRED_LITERALS.get(key)
+            if literal is not None and literal not in text:
+                continue
+            if key in cls.DIGIT_PATTERNS and not has_digit:
+                continue
             matches = pattern.findall(text)
             if matches:
                 # Deduplicate and clean
-                clean_matches = list(set([m.strip() if isinstance(m, str) else m for m in matches]))
+                clean_matches = list({m.strip() if isinstance(m, str) else m for m in matches})
                 if clean_matches:
                     results[key] = clean_matches
         return results
@@ -29,5 +40,10 @@ class IntelExtractor:
         """Alias for extract_all to match test expectations"""
         return self.extract_all(text)
 
-def get_intelligence_extractor():
-    return IntelExtractor()
+_intelligence_extractor = None
+
+def get_intelligence_extractor() -> IntelExtractor:
+    global _intelligence_extractor
+    if _intelligence_extractor is None:
+        _intelligence_extractor = IntelExtractor()
+    return _intelligence_extractor
@@ -10,6 +10,13 @@ import re
 
 from app.services.llm.client import get_extraction_llm
 
+# Intel categories the investigator extracts (all list-valued)
+INTEL_LIST_FIELDS = (
+    "upiIds", "phoneNumbers", "bankAccounts", "bankNames",
+    "ifscCodes", "amounts", "phishingLinks", "emailAddresses",
+    "caseIds", "policyNumbers", "orderNumbers"
+)
+
 
 class InvestigatorAgent:
     """
@@ -181,13 +188,8 @@ Return ONLY valid JSON matching the format specified above. No markdown, no expl
     @classmethod
     def _normalize_intel(cls, intel: Dict) -> Dict[str, List[str]]:
         """Ensure all fields are lists of clean strings."""
-        fields = [
-            "upiIds", "phoneNumbers", "bankAccounts", "bankNames",
-            "ifscCodes", "amounts", "phishingLinks", "emailAddresses",
-            "caseIds", "policyNumbers", "orderNumbers"
-        ]
         result = {}
-        for field in fields:
+        for field in INTEL_LIST_FIELDS:
             raw = intel.get(field, [])
             if isinstance(raw, list):
                 result[field] = [str(v).strip() for v in raw if v]
@@ -199,27 +201,21 @@ Return ONLY valid JSON matching the format specified above. No markdown, no expl
 
     @classmethod
     def _empty_intel(cls) -> Dict[str, List]:
-        return {
-            "upiIds": [], "phoneNumbers": [], "bankAccounts": [],
-            "bankNames": [], "ifscCodes": [], "amounts": [],
-            "phishingLinks": [], "emailAddresses": [],
-            "caseIds": [], "policyNumbers": [], "orderNumbers": [],
-            "_notes": "", "_confidence": 0.0
-        }
+        empty = {field: [] for field in INTEL_LIST_FIELDS}
+        empty["_notes"] = ""
+        empty["_confidence"] = 0.0
+        return empty
 
     @classmethod
     def merge_intel(cls, existing: Dict, new_intel: Dict) -> Dict:
-        """Merge new intel into existing, deduplicating all lists."""
+        """Merge new intel into existing, deduplicating all lists (first-seen order kept)."""
         merged = dict(existing)
-        list_fields = [
-            "upiIds", "phoneNumbers", "bankAccounts", "bankNames",
-            "ifscCodes", "amounts", "phishingLinks", "emailAddresses",
-            "caseIds", "policyNumbers", "orderNumbers"
-        ]
-        for field in list_fields:
-            existing_vals = set(merged.get(field, []))
-            new_vals = new_intel.get(field, [])
-            for v in new_vals:
-                existing_vals.add(v)
-            merged[field] = list(existing_vals)
+        for field in INTEL_LIST_FIELDS:
+            values = list(merged.get(field, []))
+            seen = set(values)
+            for v in new_intel.get(field, []):
+                if v not in seen:
+                    seen.add(v)
+                    values.append(v)
+            merged[field] = values
         return merged
@@ -3,17 +3,21 @@ Dual LLM Client - Separate clients for Engagement vs Extraction
 - Engagement: Creative responses, uses dedicated Groq key
 - Extraction: Structured JSON parsing, uses separate Groq key (isolated quota)
 """
-import json
+import logging
 import re
+import threading
 import httpx
+import orjson
 from typing import Dict, Any, Optional
 import settings
 
+logger = logging.getLogger(__name__)
+
 try:
     from groq import Groq
     GROQ_AVAILABLE = True
 except ImportError as e:
-    print(f"[WARN] Groq import failed: {e}")
+    logger.warning("Groq import failed: %s", e)
     GROQ_AVAILABLE = False
 
 try:
@@ -67,7 +71,7 @@ def _call_openrouter(prompt: str, temperature: float, max_tokens: int, model: st
             data = response.json()
             return data["choices"][0]["message"]["content"]
     except Exception as e:
-        print(f"[ERROR] OpenRouter API error: {e}")
+        logger.error("OpenRouter API error: %s", e)
         return None
 
 
@@ -86,10 +90,10 @@ def _extract_json(text: str) -> Dict[str, Any]:
             json_str = text
 
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
-        print(f"[ERROR] JSON parsing error: {e}")
-        print(f"Response text: {text[:500]}...")
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError as e:
+        logger.error("JSON parsing error: %s", e)
+        logger.debug("Response text: %.500s...", text)
         return {
             "is_scam": False,
             "confidence": 0.0,
@@ -118,9 +122,9 @@ class EngagementLLM:
             try:
                 self.groq_client = Groq(api_key=engagement_key)
                 self.groq_model = settings.LLM_MODEL_GROQ
-                print(f"[Engagement LLM] Groq initialized with key: {engagement_key[:8]}...")
+                logger.info("[Engagement LLM] Groq initialized with key: %.8s...", engagement_key)
             except Exception as e:
-                print(f"[Engagement LLM] Groq failed: {e}")
+                logger.warning("[Engagement LLM] Groq failed: %s", e)
 
         # Fallback: Gemini
         if GENAI_AVAILABLE and settings.GOOGLE_API_KEY:
@@ -131,9 +135,9 @@ class EngagementLLM:
                 else:
                     genai.configure(api_key=settings.GOOGLE_API_KEY)
                     self.gemini_client = genai.GenerativeModel(settings.LLM_MODEL_GEMINI)
-                print("[Engagement LLM] Gemini initialized (fallback)")
+                logger.info("[Engagement LLM] Gemini initialized (fallback)")
             except Exception as e:
-                print(f"[Engagement LLM] Gemini failed: {e}")
+                logger.warning("[Engagement LLM] Gemini failed: %s", e)
 
     def generate(self, prompt: str, temperature: float = 0.7, max_tokens: int = 500) -> str:
         """Generate creative response for engagement"""
@@ -149,7 +153,7 @@ class EngagementLLM:
                 )
                 return response.choices[0].message.content
             except Exception as e:
-                print(f"[Engagement LLM] Groq error: {e}")
+                logger.warning("[Engagement LLM] Groq error: %s", e)
 
         # Try OpenRouter
         result = _call_openrouter(prompt, temperature, max_tokens, ENGAGEMENT_MODEL)
@@ -173,7 +177,7 @@ class EngagementLLM:
                     response = self.gemini_client.generate_content(prompt)
                     return response.text
             except Exception as e:
-                print(f"[Engagement LLM] Gemini error: {e}")
+                logger.warning("[Engagement LLM] Gemini error: %s", e)
 
         return "I didn't quite understand. Could you please explain again?"
 
@@ -191,7 +195,7 @@ class ExtractionLLM:
         # OpenRouter as primary (cheap, isolated)
         self.has_openrouter = bool(settings.OPENROUTER_API_KEY)
         if self.has_openrouter:
-            print("[Extraction LLM] OpenRouter initialized (primary)")
+            logger.info("[Extraction LLM] OpenRouter initialized (primary)")
 
         # Get extraction-specific key, fallback to general key
         extraction_key = getattr(settings, 'GROQ_API_KEY_EXTRACTION', None) or settings.GROQ_API_KEY
@@ -201,9 +205,9 @@ class ExtractionLLM:
             try:
                 self.groq_client = Groq(api_key=extraction_key)
                 self.groq_model = settings.LLM_MODEL_GROQ
-                print(f"[Extraction LLM] Groq initialized with key: {extraction_key[:8]}... (fallback)")
+                logger.info("[Extraction LLM] Groq initialized with key: %.8s... (fallback)", extraction_key)
             except Exception as e:
-                print(f"[Extraction LLM] Groq failed: {e}")
+                logger.warning("[Extraction LLM] Groq failed: %s", e)
 
     def generate(self, prompt: str, temperature: float = 0.1, max_tokens: int = 1500) -> str:
         """Generate structured response for extraction (low temperature for consistency)"""
@@ -225,7 +229,7 @@ class ExtractionLLM:
                 )
                 return response.choices[0].message.content
             except Exception as e:
-                print(f"[Extraction LLM] Groq error: {e}")
+                logger.warning("[Extraction LLM] Groq error: %s", e)
 
         return "{}"
 
@@ -240,8 +244,9 @@ class LLMClient:
     """Unified LLM client (legacy) - wraps engagement + extraction LLMs"""
 
     def __init__(self):
-        self._engagement = EngagementLLM()
-        self._extraction = ExtractionLLM()
+        # Share the task-specific singletons instead of opening duplicate clients
+        self._engagement = get_engagement_llm()
+        self._extraction = get_extraction_llm()
 
     def generate(self, prompt: str, temperature: float = 0.7, max_tokens: int = 1000) -> str:
         return self._engagement.generate(prompt, temperature, max_tokens)
@@ -254,13 +259,17 @@ class LLMClient:
 _engagement_llm: Optional[EngagementLLM] = None
 _extraction_llm: Optional[ExtractionLLM] = None
 _llm_client: Optional[LLMClient] = None
+# Getters are called from worker threads; reentrant since LLMClient builds the other two
+_init_lock = threading.RLock()
 
 
 def get_engagement_llm() -> EngagementLLM:
     """Get engagement LLM (for generating victim responses)"""
     global _engagement_llm
     if _engagement_llm is None:
-        _engagement_llm = EngagementLLM()
+        with _init_lock:
+            if _engagement_llm is None:
+                _engagement_llm = EngagementLLM()
     return _engagement_llm
 
 
@@ -268,7 +277,9 @@ def get_extraction_llm() -> ExtractionLLM:
     """Get extraction LLM (for parsing intelligence from messages)"""
     global _extraction_llm
     if _extraction_llm is None:
-        _extraction_llm = ExtractionLLM()
+        with _init_lock:
+            if _extraction_llm is None:
+                _extraction_llm = ExtractionLLM()
     return _extraction_llm
 
 
@@ -276,5 +287,7 @@ def get_llm_client() -> LLMClient:
     """Get unified LLM client (legacy compatibility)"""
     global _llm_client
     if _llm_client is None:
-        _llm_client = LLMClient()
+        with _init_lock:
+            if _llm_client is None:
+                _llm_client = LLMClient()
     return _llm_client
@@ -0,0 +1,64 @@
+"""
+Proximity cache - approximate lookup keyed on query embeddings
+Scam campaigns reuse templates, so a new query is often a near-duplicate of one
+already answered; its retrieval result can be reused without touching Chroma.
+"""
+import threading
+from typing import Any, List, Optional
+
+import numpy as np
+
+
+class ProximityCache:
+    """
+    Returns the value stored for a previous embedding whose cosine similarity
+    to the query is at least `threshold`.
+
+    Embeddings are kept unit-length in one preallocated (capacity, d) matrix,
+    so a lookup is a single matrix-vector product. Oldest entries are
+    overwritten first (FIFO ring buffer).
+    """
+
+    def __init__(self, capacity: int = 1024, threshold: float = 0.95):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._vectors: Optional[np.ndarray] = None  # allocated on first put (needs d)
+        self._values: List[Any] = []
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def get(self, embedding) -> Optional[Any]:
+        """Value of the closest cached embedding, if close enough."""
+        query = self._unit(embedding)
+        with self._lock:
+            size = len(self._values)
+            if size == 0:
+                return None
+            scores = self._vectors[:size] @ query
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold:
+                return self._values[best]
+        return None
+
+    def put(self, embedding, value: Any):
+        """Cache value under embedding, evicting the oldest entry when full."""
+        vector = self._unit(embedding)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.empty((self.capacity, vector.shape[0]), dtype=np.float32)
+            slot = self._next
+            self._vectors[slot] = vector
+            if slot < len(self._values):
+                self._values[slot] = value
+            else:
+                self._values.append(value)
+            self._next = (slot + 1) % self.capacity
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -3,8 +3,11 @@ OPTIMIZED Vector Store - Fast initialization
 Key: Lazy loads embedding model only when needed
 """
 import chromadb
-from typing import List, Dict, Any, Optional
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import json
+import threading
 from pathlib import Path
 import settings
 
@@ -19,6 +22,118 @@ def get_sentence_transformer():
         _SentenceTransformer = ST
     return _SentenceTransformer
 
+
+class QueryBatcher:
+    """
+    Coalesces concurrent collection.query calls into one batched query.
+    
+    Callers arriving within `window` seconds (or until `max_batch` are queued)
+    share a single Chroma round-trip; each gets back its own slice of the result.
+    """
+    
+    def __init__(self, collection, window: float = 0.005, max_batch: int = 32):
+        self.collection = collection
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[List[float], int, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    async def query(self, embedding: List[float], n_results: int) -> Dict[str, Any]:
+        """Queue one query embedding and wait for its share of the batched result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((embedding, n_results, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+    
+    async def _run(self, batch: List[Tuple[List[float], int, asyncio.Future]]):
+        # Results are distance-ordered, so one query at the largest k serves every caller
+        n_max = max(n for _, n, _ in batch)
+        try:
+            results = await asyncio.to_thread(
+                self.collection.query,
+                query_embeddings=[embedding for embedding, _, _ in batch],
+                n_results=n_max
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for i, (_, n, future) in enumerate(batch):
+            if not future.done():
+                future.set_result({
+                    key: [results[key][i][:n]]
+                    for key in ("ids", "metadatas", "documents", "distances")
+                    if results.get(key)
+                })
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent query encodes into one batched forward pass.
+    
+    Same time/size flush as QueryBatcher: texts arriving within `window`
+    seconds (or until `max_batch` are queued) are embedded together, and each
+    caller gets back its own row.
+    """
+    
+    def __init__(self, encode_batch, window: float = 0.005, max_batch: int = 32):
+        self.encode_batch = encode_batch
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    async def encode(self, text: str) -> np.ndarray:
+        """Queue one text and wait for its embedding."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+    
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            embeddings = await asyncio.to_thread(self.encode_batch, [text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
 class VectorStore:
     def __init__(self):
         # FAST: ChromaDB client
@@ -34,25 +149,59 @@ class VectorStore:
         # LAZY: Don't load model yet
         self.embedding_model = None
         self._model_loaded = False
+        self._model_lock = threading.Lock()
+        
+        # Created on first async query (needs the running event loop)
+        self._batcher: Optional[QueryBatcher] = None
+        self._embed_batcher: Optional[EmbeddingBatcher] = None
     
     def _ensure_model_loaded(self):
         """Load model only when needed (first query)."""
         if self._model_loaded:
             return
         
-        print("[VectorStore] Loading embedding model (3-5s)...")
-        import warnings
-        warnings.filterwarnings('ignore')
-        
-        ST = get_sentence_transformer()
-        self.embedding_model = ST(settings.EMBEDDING_MODEL, device='cpu')
-        self._model_loaded = True
-        print("[VectorStore] Model loaded OK")
+        # Queries may arrive from worker threads; load the model only once
+        with self._model_lock:
+            if self._model_loaded:
+                return
+            
+            print("[VectorStore] Loading embedding model (3-5s)...")
+            import warnings
+            warnings.filterwarnings('ignore')
+            
+            ST = get_sentence_transformer()
+            model = ST(settings.EMBEDDING_MODEL, device='cpu')
+            if settings.EMBEDDING_QUANTIZE_INT8:
+                # Stored pattern embeddings stay FP32; re-validate retrieval before enabling
+                import torch
+                torch.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                )
+                print("[VectorStore] Embedding model quantized to INT8")
+            self.embedding_model = model
+            self._model_loaded = True
+            print("[VectorStore] Model loaded OK")
     
     def embed_text(self, text: str) -> List[float]:
+        return self.encode_query(text).tolist()
+    
+    def encode_query(self, text: str) -> np.ndarray:
+        """Query embedding as a float32 array (same vector Chroma is queried with)."""
         self._ensure_model_loaded()
         embedding = self.embedding_model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        return embedding.astype(np.float32, copy=False)
+    
+    def encode_queries(self, texts: List[str]) -> np.ndarray:
+        """Embed several queries in one forward pass; one float32 row per text."""
+        self._ensure_model_loaded()
+        embeddings = self.embedding_model.encode(texts, convert_to_numpy=True, batch_size=len(texts))
+        return embeddings.astype(np.float32, copy=False)
+    
+    async def encode_query_async(self, text: str) -> np.ndarray:
+        """encode_query for async callers; concurrent calls share one batched encode."""
+        if self._embed_batcher is None:
+            self._embed_batcher = EmbeddingBatcher(self.encode_queries)
+        return await self._embed_batcher.encode(text)
     
     def add_patterns(self, patterns: List[Dict[str, Any]]):
         if self.collection.count() > 0:
@@ -60,12 +209,11 @@ class VectorStore:
         
         self._ensure_model_loaded()
         
-        ids, embeddings, metadatas, documents = [], [], [], []
+        ids, texts, metadatas, documents = [], [], [], []
         
         for i, pattern in enumerate(patterns):
             ids.append(str(pattern.get("id", i)))
-            text = f"{pattern.get('pattern', '')} {pattern.get('example_message', '')}"
-            embeddings.append(self.embed_text(text))
+            texts.append(f"{pattern.get('pattern', '')} {pattern.get('example_message', '')}")
             metadatas.append({
                 "category": pattern.get("category", "unknown"),
                 "scam_type": pattern.get("scam_type", "unknown"),
@@ -73,6 +221,9 @@ class VectorStore:
             })
             documents.append(pattern.get("pattern", ""))
         
+        # Embed the whole corpus in one batched forward pass
+        embeddings = self.embedding_model.encode(texts, convert_to_numpy=True, batch_size=64).tolist()
+        
         # Batch add
         batch_size = 50
         for i in range(0, len(ids), batch_size):
@@ -94,6 +245,14 @@ class VectorStore:
             n_results=n_results
         )
         
+        return self._format_query_result(query_text, results)
+    
+    async def _batched_query(self, query_embedding: List[float], n_results: int) -> Dict[str, Any]:
+        if self._batcher is None:
+            self._batcher = QueryBatcher(self.collection)
+        return await self._batcher.query(query_embedding, n_results)
+    
+    def _format_query_result(self, query_text: str, results: Dict[str, Any]) -> Dict[str, Any]:
         formatted = []
         if results and results['ids'] and len(results['ids'][0]) > 0:
             for i in range(len(results['ids'][0])):
@@ -111,7 +270,23 @@ class VectorStore:
     def search(self, query_text: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """Used by rag_retriever."""
         result = self.query_similar(query_text, n_results=top_k)
-        
+        return self._to_search_matches(result)
+    
+    def search_by_embedding(self, query_text: str, embedding: np.ndarray, top_k: int = 5) -> List[Dict[str, Any]]:
+        """search() for a query the caller has already embedded."""
+        results = self.collection.query(
+            query_embeddings=[embedding.tolist()],
+            n_results=top_k
+        )
+        return self._to_search_matches(self._format_query_result(query_text, results))
+    
+    async def search_by_embedding_async(self, query_text: str, embedding: np.ndarray, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Async search for a query the caller has already embedded; concurrent calls share one Chroma query."""
+        results = await self._batched_query(embedding.tolist(), top_k)
+        return self._to_search_matches(self._format_query_result(query_text, results))
+    
+    @staticmethod
+    def _to_search_matches(result: Dict[str, Any]) -> List[Dict[str, Any]]:
         matches = []
         for match in result.get("matches", []):
             matches.append({
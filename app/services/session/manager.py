@@ -3,14 +3,19 @@ Session Manager for conversation state management
 Supports in-memory and Redis storage
 """
 from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-import json
+import asyncio
+import time
+import queue
+import threading
 import settings
-from app.models.session import SessionData
+from app.models.session import SessionData, SESSION_ADAPTER
 
 # In-memory storage
 _sessions: Dict[str, SessionData] = {}
 
+# Pause before retrying session writes after a Redis error
+_WRITE_RETRY_DELAY = 1.0
+
 
 class SessionManager:
     """Manages conversation sessions"""
@@ -24,6 +29,15 @@ class SessionManager:
             try:
                 import redis
                 self.redis_client = redis.from_url(settings.REDIS_URL)
+                
+                # Write-behind: Redis SETs happen on a background thread,
+                # off the request's critical path
+                self._write_queue: "queue.Queue[tuple]" = queue.Queue()
+                # session_id -> writes queued but not yet in Redis (reads must not
+                # go to Redis for these, it would return an older snapshot)
+                self._pending_writes: Dict[str, int] = {}
+                self._pending_lock = threading.Lock()
+                threading.Thread(target=self._writer_loop, name="session-writer", daemon=True).start()
                 print("[OK] Redis session store initialized")
             except Exception as e:
                 print(f"[ERROR] Redis initialization failed: {e}")
@@ -51,20 +65,48 @@ class SessionManager:
     
     def get_session(self, session_id: str) -> Optional[SessionData]:
         """Retrieve a session"""
-        if self.use_redis and self.redis_client:
-            try:
-                data = self.redis_client.get(f"session:{session_id}")
-                if data:
-                    session_dict = json.loads(data)
-                    return SessionData(**session_dict)
-            except Exception as e:
-                print(f"[ERROR] Redis get error: {e}")
+        if self._reads_redis(session_id):
+            session = self._load_from_redis(session_id)
+            if session is not None:
+                return session
         
         return _sessions.get(session_id)
     
-    def update_session(self, session: SessionData):
+    async def get_session_async(self, session_id: str) -> Optional[SessionData]:
+        """get_session for async handlers: the Redis read runs off the event loop"""
+        if self._reads_redis(session_id):
+            session = await asyncio.to_thread(self._load_from_redis, session_id)
+            if session is not None:
+                return session
+        
+        return _sessions.get(session_id)
+    
+    def _reads_redis(self, session_id: str) -> bool:
+        """
+        Redis is the source of truth shared by all workers. The in-process copy
+        is only newer while this process still has a write for it queued.
+        """
+        if not (self.use_redis and self.redis_client):
+            return False
+        with self._pending_lock:
+            return session_id not in self._pending_writes
+    
+    def _load_from_redis(self, session_id: str) -> Optional[SessionData]:
+        try:
+            data = self.redis_client.get(f"session:{session_id}")
+            if data:
+                session = SESSION_ADAPTER.validate_json(data)
+                # Refresh the local backup copy
+                _sessions[session_id] = session
+                return session
+        except Exception as e:
+            print(f"[ERROR] Redis get error: {e}")
+        
+        return None
+    
+    def update_session(self, session: SessionData, now: Optional[float] = None):
         """Update an existing session"""
-        session.updated_at = datetime.now()
+        session.updated_at = time.time() if now is None else now
         self._save_session(session)
     
     def delete_session(self, session_id: str):
@@ -82,18 +124,72 @@ class SessionManager:
         """Save session to storage"""
         if self.use_redis and self.redis_client:
             try:
-                session_dict = session.dict()
-                
-                self.redis_client.setex(
-                    f"session:{session.session_id}",
-                    settings.SESSION_TIMEOUT,
-                    json.dumps(session_dict)
-                )
+                # Serialize now (snapshot), write later
+                payload = SESSION_ADAPTER.dump_json(session)
+                with self._pending_lock:
+                    self._pending_writes[session.session_id] = self._pending_writes.get(session.session_id, 0) + 1
+                self._write_queue.put_nowait((session.session_id, payload))
             except Exception as e:
                 print(f"[ERROR] Redis save error: {e}")
         
         # Always save to in-memory as backup
         _sessions[session.session_id] = session
+    
+    def flush(self, timeout: float = 5.0):
+        """Wait (up to timeout) for queued session writes to reach Redis (call on shutdown)."""
+        if self.use_redis and self.redis_client:
+            # Failed writes are retried, so join() could block forever while Redis is down
+            deadline = time.monotonic() + timeout
+            while self._write_queue.unfinished_tasks and time.monotonic() < deadline:
+                time.sleep(0.05)
+    
+    def _writer_loop(self):
+        """Drain queued session writes to Redis, one pipelined round-trip per batch."""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < 64:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # A session saved several times in one batch only needs its last snapshot
+            latest = dict(batch)
+            written = False
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for session_id, payload in latest.items():
+                    if payload is None:
+                        # Retry of a failed write: persist whatever is current in memory
+                        session = _sessions.get(session_id)
+                        if session is None:
+                            continue
+                        payload = SESSION_ADAPTER.dump_json(session)
+                    pipe.setex(f"session:{session_id}", settings.SESSION_TIMEOUT, payload)
+                pipe.execute()
+                written = True
+            except Exception as e:
+                print(f"[ERROR] Redis save error: {e}")
+            finally:
+                with self._pending_lock:
+                    if not written:
+                        # Still not in Redis: reads must keep using the in-memory copy
+                        for session_id in latest:
+                            self._pending_writes[session_id] = self._pending_writes.get(session_id, 0) + 1
+                    for session_id, _ in batch:
+                        remaining = self._pending_writes.get(session_id, 0) - 1
+                        if remaining > 0:
+                            self._pending_writes[session_id] = remaining
+                        else:
+                            self._pending_writes.pop(session_id, None)
+                if not written:
+                    for session_id in latest:
+                        self._write_queue.put_nowait((session_id, None))
+                for _ in batch:
+                    self._write_queue.task_done()
+            
+            if not written:
+                time.sleep(_WRITE_RETRY_DELAY)
 
 
 # Global instance
@@ -1,6 +1,12 @@
 """
 Utility functions for the application.
 """
-from app.utils.session_logger import SessionLogger
-
 __all__ = ['SessionLogger']
+
+
+def __getattr__(name):
+    # Lazy re-export: importing a sibling submodule doesn't pull in SessionLogger's deps
+    if name == 'SessionLogger':
+        from app.utils.session_logger import SessionLogger
+        return SessionLogger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
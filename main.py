@@ -4,16 +4,22 @@ Agentic Honey-Pot API - Production Ready
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+import asyncio
+import logging
 import settings
 from app.api.routes import message, health
+from app.services.session.manager import get_session_manager
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Agentic Honey-Pot API",
     description="AI-powered scam detection and engagement",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS
@@ -32,17 +38,12 @@ app.include_router(message.router, prefix="/api", tags=["Message"])
 # Validation Error Handler - Log exact details
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    print("=" * 60)
-    print("[VALIDATION ERROR] 422 Unprocessable Entity")
-    print(f"[VALIDATION ERROR] URL: {request.url}")
-    try:
-        body = await request.body()
-        print(f"[VALIDATION ERROR] Body: {body}")
-    except:
-        pass
+    logger.warning("422 Unprocessable Entity: %s", request.url)
+    # The route already consumed the request stream; FastAPI keeps what it read on
+    # the exception (awaiting request.body() here would block forever)
+    logger.warning("Body: %s", exc.body)
     for error in exc.errors():
-        print(f"[VALIDATION ERROR] Field: {error.get('loc')} - {error.get('msg')}")
-    print("=" * 60)
+        logger.warning("Field: %s - %s", error.get('loc'), error.get('msg'))
     return JSONResponse(
         status_code=422,
         content={"detail": exc.errors()}
@@ -51,14 +52,11 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # GLOBAL Exception Handler - Prevent 500 crashes
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    import traceback
-    print("=" * 60)
-    print(f"[CRITICAL ERROR] Unhandled exception: {type(exc).__name__}")
-    print(f"[CRITICAL ERROR] Message: {str(exc)}")
-    print(f"[CRITICAL ERROR] URL: {request.url}")
-    print(f"[CRITICAL ERROR] Traceback:")
-    traceback.print_exc()
-    print("=" * 60)
+    logger.error(
+        "Unhandled exception on %s: %s: %s",
+        request.url, type(exc).__name__, exc,
+        exc_info=(type(exc), exc, exc.__traceback__)
+    )
 
     # Return a valid response instead of crashing
     return JSONResponse(
@@ -92,14 +90,37 @@ async def startup_event():
     print(f"Threshold: {settings.DETECTION_THRESHOLD}")
     print("=" * 60)
     
-    # Pre-load vector store
-    try:
-        from app.services.rag.vector_store import get_vector_store
-        vs = get_vector_store()
-        if vs.collection.count() == 0:
-            vs.load_dataset_from_json()
-    except Exception as e:
-        print(f"[Startup] Vector store: {e}")
+    # Warm independent services in parallel (Chroma open, LLM clients, session store)
+    results = await asyncio.gather(
+        asyncio.to_thread(_warm_vector_store),
+        asyncio.to_thread(_warm_llm_clients),
+        asyncio.to_thread(get_session_manager),
+        return_exceptions=True
+    )
+    for name, result in zip(("Vector store", "LLM clients", "Session store"), results):
+        if isinstance(result, Exception):
+            print(f"[Startup] {name}: {result}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Don't lose session writes still queued for Redis
+    await asyncio.to_thread(get_session_manager().flush)
+
+
+def _warm_vector_store():
+    """Open Chroma and seed the collection if empty (embedding model stays lazy)"""
+    from app.services.rag.vector_store import get_vector_store
+    vs = get_vector_store()
+    if vs.collection.count() == 0:
+        vs.load_dataset_from_json()
+
+
+def _warm_llm_clients():
+    """Create the LLM clients and detector before the first request"""
+    from app.services.detection.llm_detector import get_llm_detector
+    get_llm_detector()
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,17 +3,30 @@ Global configuration for Agentic Honey-Pot
 Loads environment variables and provides settings
 """
 import os
+import logging
 from dotenv import load_dotenv
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.absolute()
 load_dotenv()
 
+# Logging (configured first so the messages below honour LOG_LEVEL)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FILE = os.getenv("LOG_FILE", "honeypot.log")
+# getLevelName maps a known name to its number and returns a string otherwise
+_log_level = logging.getLevelName(LOG_LEVEL.upper())
+if not isinstance(_log_level, int):
+    _log_level = logging.INFO
+logging.basicConfig(level=_log_level, format="[%(name)s] %(message)s")
+logger = logging.getLogger(__name__)
+if _log_level == logging.INFO and LOG_LEVEL.upper() != "INFO":
+    logger.warning("Unknown LOG_LEVEL %r, using INFO", LOG_LEVEL)
+
 # API Configuration
 APP_X_API_KEY = os.getenv("APP_X_API_KEY")
 API_KEY = APP_X_API_KEY
 if not API_KEY:
-    print("WARNING: APP_X_API_KEY not set in .env. Using unsafe default for dev.")
+    logger.warning("APP_X_API_KEY not set in .env. Using unsafe default for dev.")
     API_KEY = "honeypot_secret_key_2024"
     APP_X_API_KEY = API_KEY
 HOST = os.getenv("HOST", "0.0.0.0")
@@ -28,16 +41,16 @@ GROQ_API_KEY_EXTRACTION = os.getenv("GROQ_API_KEY_EXTRACTION")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")  # Legacy fallback
 
 if GROQ_API_KEY_ENGAGEMENT:
-    print(f"[Settings] GROQ Engagement Key: {GROQ_API_KEY_ENGAGEMENT[:8]}...")
+    logger.info("GROQ Engagement Key: %s...", GROQ_API_KEY_ENGAGEMENT[:8])
 if GROQ_API_KEY_EXTRACTION:
-    print(f"[Settings] GROQ Extraction Key: {GROQ_API_KEY_EXTRACTION[:8]}...")
+    logger.info("GROQ Extraction Key: %s...", GROQ_API_KEY_EXTRACTION[:8])
 if GROQ_API_KEY:
-    print(f"[Settings] GROQ Fallback Key: {GROQ_API_KEY[:8]}...")
+    logger.info("GROQ Fallback Key: %s...", GROQ_API_KEY[:8])
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 if OPENROUTER_API_KEY:
-    print(f"[Settings] OpenRouter Key: {OPENROUTER_API_KEY[:12]}...")
+    logger.info("OpenRouter Key: %s...", OPENROUTER_API_KEY[:12])
 
 # Model Selection - Using best available models
 LLM_MODEL_GROQ = os.getenv("LLM_MODEL_GROQ", "llama-3.3-70b-versatile")
@@ -47,11 +60,14 @@ LLM_MODEL_OPENROUTER = os.getenv("LLM_MODEL_OPENROUTER", "google/gemini-2.0-flas
 # Vector Store Configuration
 CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", str(PROJECT_ROOT / "chroma_db"))
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+# INT8 dynamic quantization of the embedding model's Linear layers (CPU speedup, slight accuracy cost)
+EMBEDDING_QUANTIZE_INT8 = os.getenv("EMBEDDING_QUANTIZE_INT8", "false").lower() == "true"
 
 # Session Configuration
 USE_REDIS = os.getenv("USE_REDIS", "false").lower() == "true"
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 SESSION_TIMEOUT = int(os.getenv("SESSION_TIMEOUT", "3600"))
+SESSION_HISTORY_LIMIT = int(os.getenv("SESSION_HISTORY_LIMIT", "10"))  # Messages kept on the session
 
 # GUVI Integration
 GUVI_API_KEY = os.getenv("GUVI_API_KEY")
@@ -68,12 +84,8 @@ MIN_INTELLIGENCE_TURNS = int(os.getenv("MIN_INTELLIGENCE_TURNS", "8"))
 # Language Support (SIMPLIFIED - ENGLISH ONLY)
 SUPPORTED_LANGUAGES = ["en", "unknown"]  # "unknown" gets benefit of doubt
 
-# Logging
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE = os.getenv("LOG_FILE", "honeypot.log")
-
-print("[Settings] Configuration loaded successfully")
-print(f"[Settings] LLM Provider: {LLM_PROVIDER}")
-print(f"[Settings] Detection Threshold: {DETECTION_THRESHOLD}")
-print(f"[Settings] Supported Languages: {SUPPORTED_LANGUAGES}")
-print(f"[Settings] Max Turns: {MAX_TURNS}")
+logger.info("Configuration loaded successfully")
+logger.info("LLM Provider: %s", LLM_PROVIDER)
+logger.info("Detection Threshold: %s", DETECTION_THRESHOLD)
+logger.info("Supported Languages: %s", SUPPORTED_LANGUAGES)
+logger.info("Max Turns: %s", MAX_TURNS)
@@ -10,6 +10,7 @@ Simulates the GUVI evaluation exactly:
 Usage:
     SCAMMER_API_KEY=sk-... python tests/guvi_eval_test.py
     SCAMMER_API_KEY=sk-... HONEYPOT_URL=https://your-space.hf.space python tests/guvi_eval_test.py
+    SCAMMER_API_KEY=sk-... EVAL_CONCURRENT=true python tests/guvi_eval_test.py  # all scenarios at once
 """
 
 import asyncio
@@ -34,10 +35,45 @@ HONEYPOT_KEY   = os.getenv("HONEYPOT_API_KEY", "dev-key-123")
 SCAMMER_KEY    = os.getenv("SCAMMER_API_KEY",  "")
 SCAMMER_MODEL  = os.getenv("SCAMMER_MODEL",    "")   # auto-detected if blank
 MAX_TURNS      = 5
+CONCURRENT     = os.getenv("EVAL_CONCURRENT", "false").lower() == "true"
 REQUEST_TIMEOUT = 35
 
 ENDPOINT = f"{HONEYPOT_URL}/api/message"
 
+# Shared keep-alive client for honeypot calls (one connection pool per run)
+_honeypot_client: httpx.AsyncClient | None = None
+
+
+def get_honeypot_client() -> httpx.AsyncClient:
+    """Return the pooled honeypot client, creating it on first use."""
+    global _honeypot_client
+    if _honeypot_client is None:
+        _honeypot_client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=4)
+        )
+    return _honeypot_client
+
+
+# Shared client for scammer LLM calls. Provider APIs speak HTTP/2, so turns
+# multiplex over one connection when the h2 extra is installed (httpx[http2]).
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_scammer_client: httpx.AsyncClient | None = None
+
+
+def get_scammer_client() -> httpx.AsyncClient:
+    """Return the pooled scammer-LLM client, creating it on first use."""
+    global _scammer_client
+    if _scammer_client is None:
+        _scammer_client = httpx.AsyncClient(timeout=30, http2=HTTP2_AVAILABLE)
+    return _scammer_client
+
 def _detect_provider(api_key: str, model_override: str) -> tuple[str, str]:
     """Auto-detect provider from key prefix and return (base_url, model)."""
     if api_key.startswith("gsk_"):
@@ -231,10 +267,10 @@ async def scammer_respond(
         "max_tokens": 200,
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        resp = await client.post(f"{base_url}/chat/completions", headers=headers, json=payload)
-        resp.raise_for_status()
-        return resp.json()["choices"][0]["message"]["content"].strip()
+    client = get_scammer_client()
+    resp = await client.post(f"{base_url}/chat/completions", headers=headers, json=payload)
+    resp.raise_for_status()
+    return resp.json()["choices"][0]["message"]["content"].strip()
 
 
 # ─────────────────────────────────────────────
@@ -258,19 +294,15 @@ async def call_honeypot(
         "conversationHistory": conversation_history,
         "metadata": {}
     }
-    headers = {
-        "Content-Type": "application/json",
-        "x-api-key": api_key
-    }
-    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-        start = time.time()
-        resp = await client.post(ENDPOINT, headers=headers, json=payload)
-        elapsed = time.time() - start
-        if resp.status_code != 200:
-            return {"error": f"HTTP {resp.status_code}: {resp.text}", "latency": elapsed}
-        data = resp.json()
-        data["_latency"] = round(elapsed, 2)
-        return data
+    client = get_honeypot_client()
+    start = time.time()
+    resp = await client.post(ENDPOINT, headers={"x-api-key": api_key}, json=payload)
+    elapsed = time.time() - start
+    if resp.status_code != 200:
+        return {"error": f"HTTP {resp.status_code}: {resp.text}", "latency": elapsed}
+    data = resp.json()
+    data["_latency"] = round(elapsed, 2)
+    return data
 
 
 # ─────────────────────────────────────────────
@@ -494,12 +526,13 @@ async def run_scenario(scenario: dict) -> ScenarioScore:
     scammer_conversation: list[dict] = []  # for scammer AI
     honeypot_history: list[dict] = []      # for honeypot API
     latencies: list[float] = []
+    tag = scenario["id"]  # scenarios run concurrently, so prefix turn logs
 
     start_time = time.time()
     current_scammer_msg = scenario["opening_message"]
 
     for turn in range(1, MAX_TURNS + 1):
-        print(f"\n  [Turn {turn}] Scammer: {current_scammer_msg[:80]}...")
+        print(f"\n  [{tag} Turn {turn}] Scammer: {current_scammer_msg[:80]}...")
 
         # Call honeypot
         hp_response = await call_honeypot(
@@ -510,7 +543,7 @@ async def run_scenario(scenario: dict) -> ScenarioScore:
         )
 
         if "error" in hp_response:
-            print(f"  [ERROR] Honeypot failed: {hp_response['error']}")
+            print(f"  [{tag} ERROR] Honeypot failed: {hp_response['error']}")
             break
 
         latencies.append(hp_response.get("_latency", 0))
@@ -518,7 +551,7 @@ async def run_scenario(scenario: dict) -> ScenarioScore:
 
         reply = hp_response.get("reply") or ""
         detected = hp_response.get("scamDetected", False)
-        print(f"  [Turn {turn}] Honeypot reply: {reply[:80]}...")
+        print(f"  [{tag} Turn {turn}] Honeypot reply: {reply[:80]}...")
         print(f"             Detected={detected} | Latency={hp_response['_latency']}s")
 
         # Update honeypot history
@@ -539,7 +572,7 @@ async def run_scenario(scenario: dict) -> ScenarioScore:
                     model=SCAMMER_MODEL
                 )
             except Exception as e:
-                print(f"  [WARN] Scammer AI error: {e}")
+                print(f"  [{tag} WARN] Scammer AI error: {e}")
                 break
 
     end_time = time.time()
@@ -605,13 +638,25 @@ async def main():
     print(f"Scammer AI    : {model}  ({base_url.split('/')[2]})")
     print(f"Scenarios     : {len(SCENARIOS)}")
     print(f"Turns / run   : {MAX_TURNS}")
+    print(f"Concurrent    : {CONCURRENT}")
     print()
 
     # Run scenarios
     all_results: list[ScenarioScore] = []
-    for scenario in SCENARIOS:
-        result = await run_scenario(scenario)
-        all_results.append(result)
+    # Scenarios use separate sessions, so they can run side by side;
+    # turns within a scenario stay sequential (each depends on the last reply)
+    try:
+        if CONCURRENT:
+            all_results = list(await asyncio.gather(
+                *(run_scenario(scenario) for scenario in SCENARIOS)
+            ))
+        else:
+            for scenario in SCENARIOS:
+                result = await run_scenario(scenario)
+                all_results.append(result)
+    finally:
+        await get_honeypot_client().aclose()
+        await get_scammer_client().aclose()
 
     # Compute final scores
     weighted_sum = sum(r.total * r.weight / 100 for r in all_results)
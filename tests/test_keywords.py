@@ -0,0 +1,51 @@
+"""
+Keyword scanner and the strong-keyword LLM bypass.
+
+The bypass labels a message a scam without asking the LLM, so warnings,
+news and look-alike words must never satisfy it.
+
+Usage:
+    python -m pytest tests/test_keywords.py
+"""
+from app.services.detection.keywords import scan
+from app.services.detection.llm_detector import detect_strong_keywords
+
+SCAM = "Digital arrest warrant issued for money laundering. Pay Rs 50000 via UPI now to avoid jail."
+NEWS = (
+    "News: ED files money laundering case; court issues arrest warrant. "
+    "Stupid mistake by accused, says repayment pending"
+)
+WARNING = "Beware: CBI never calls about digital arrest or money laundering cases."
+
+
+def test_demand_cues_match_whole_words_only():
+    hits = scan(NEWS)
+    assert "demand" not in hits
+    assert hits["scam_strong"] == ["money laundering", "arrest warrant"]
+
+
+def test_demand_cues_found_in_scam():
+    assert scan(SCAM)["demand"] == ["pay", "upi"]
+
+
+def test_cbi_is_not_a_strong_tell():
+    assert "cbi" not in scan("CBI officer calling, CBI case filed").get("scam_strong", [])
+
+
+def test_bypass_decides_explicit_scam():
+    result = detect_strong_keywords(SCAM)
+    assert result is not None
+    assert result.is_scam and result.bypass_llm
+    assert result.primary_category == "digital_arrest"
+
+
+def test_bypass_skips_news():
+    assert detect_strong_keywords(NEWS) is None
+
+
+def test_bypass_skips_warning():
+    assert detect_strong_keywords(WARNING) is None
+
+
+def test_bypass_needs_two_strong_tells():
+    assert detect_strong_keywords("Money laundering case against you. Pay now.") is None
@@ -0,0 +1,86 @@
+"""
+Near-duplicate verdict cache in the LLM detector.
+
+Edited copies of a scam template may reuse its verdict; not-scam verdicts
+are never reused, so a negated rewrite that embeds right next to a
+template still goes to the LLM.
+
+Usage:
+    python -m pytest tests/test_similar_cache.py
+"""
+import numpy as np
+
+from app.services.detection.llm_detector import LLMDetector
+from app.services.detection.rag_retriever import RAGRetrievalResult
+
+SCAM = "Your SBI account is blocked. Pay Rs 5000 to UPI id sbi.kyc@ybl within 1 hour to unblock."
+EDITED = "Your SBI account is blocked. Pay Rs 4500 to UPI id sbi.help@ybl within 2 hours to unblock."
+NEGATED = "SBI never blocks your account or asks you to pay to a UPI id to unblock it."
+
+# Stand-ins for query embeddings: EDITED/NEGATED land next to SCAM, FAR does not
+_rng = np.random.default_rng(0)
+SCAM_VEC = _rng.standard_normal(384).astype(np.float32)
+NEAR_VEC = SCAM_VEC + 0.05 * _rng.standard_normal(384).astype(np.float32)
+FAR_VEC = _rng.standard_normal(384).astype(np.float32)
+
+
+class FakeLLM:
+    """Answers with a fixed verdict and counts calls."""
+
+    def __init__(self, is_scam: bool):
+        self.is_scam = is_scam
+        self.calls = 0
+
+    def generate_json(self, prompt, temperature=0.3):
+        self.calls += 1
+        return {
+            "is_scam": self.is_scam,
+            "confidence": 0.9,
+            "primary_category": "bank_kyc" if self.is_scam else None,
+            "reasoning": "test",
+        }
+
+
+def _rag(message: str, category="bank_kyc") -> RAGRetrievalResult:
+    return RAGRetrievalResult(query=message, matches=[], top_category=category, has_high_similarity=True)
+
+
+def _detector(is_scam: bool):
+    detector = LLMDetector()
+    detector.llm_client = FakeLLM(is_scam)
+    return detector, detector.llm_client
+
+
+def test_edited_scam_template_reuses_verdict():
+    detector, llm = _detector(is_scam=True)
+    detector.detect_normal_mode(SCAM, _rag(SCAM), embedding=SCAM_VEC)
+    result = detector.detect_normal_mode(EDITED, _rag(EDITED), embedding=NEAR_VEC)
+    assert llm.calls == 1
+    assert result.is_scam
+    assert result.raw_response == {"similar_cache_hit": True}
+
+
+def test_edited_template_with_other_category_misses():
+    detector, llm = _detector(is_scam=True)
+    detector.detect_normal_mode(SCAM, _rag(SCAM), embedding=SCAM_VEC)
+    detector.detect_normal_mode(EDITED, _rag(EDITED, category="lottery"), embedding=NEAR_VEC)
+    assert llm.calls == 2
+
+
+def test_distant_message_misses():
+    detector, llm = _detector(is_scam=True)
+    detector.detect_normal_mode(SCAM, _rag(SCAM), embedding=SCAM_VEC)
+    detector.detect_normal_mode(EDITED, _rag(EDITED), embedding=FAR_VEC)
+    assert llm.calls == 2
+
+
+def test_not_scam_verdict_is_never_reused():
+    detector, llm = _detector(is_scam=False)
+    detector.detect_normal_mode(NEGATED, _rag(NEGATED), embedding=SCAM_VEC)
+    assert len(detector._similar_cache) == 0
+
+    # Scam template embedding right next to the negated one still asks the LLM
+    detector.llm_client.is_scam = True
+    result = detector.detect_normal_mode(SCAM, _rag(SCAM), embedding=NEAR_VEC)
+    assert llm.calls == 2
+    assert result.is_scam
@@ -0,0 +1,23 @@
+"""
+Regression check: invalid /api/message bodies must get a 422, not hang.
+
+Usage:
+    python -m pytest tests/test_validation_errors.py
+"""
+from fastapi.testclient import TestClient
+
+import settings
+from main import app
+
+client = TestClient(app)
+HEADERS = {"x-api-key": settings.API_KEY, "Content-Type": "application/json"}
+
+
+def test_malformed_json_returns_422():
+    response = client.post("/api/message", content=b'{"sessionId": "s1", "message": ', headers=HEADERS)
+    assert response.status_code == 422
+
+
+def test_missing_session_id_returns_422():
+    response = client.post("/api/message", json={"message": {"text": "hi"}}, headers=HEADERS)
+    assert response.status_code == 422